@@ -0,0 +1,21 @@
+"""
+Запуск сервиса в production-режиме.
+
+Пример:
+    python -m app
+    python -m app --workers 4 --port 8080
+"""
+import argparse
+
+from app.core.config import settings
+from app.server import available_cpus, run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Запуск Auth-Service")
+    parser.add_argument("--host", default=settings.SERVER_HOST, help="Адрес для входящих соединений")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT, help="Порт")
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS or available_cpus(),
+                        help="Количество процессов сервера (по умолчанию — по числу CPU)")
+    args = parser.parse_args()
+    run(args.host, args.port, args.workers)
@@ -0,0 +1,65 @@
+import asyncio
+import io
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies.auth_dep import require_roles
+from app.core.config import settings
+from app.dependencies.repository_dep import get_session_read_only
+from app.exceptions import ImportFileTooLargeException, ImportJobNotFoundException
+from app.models.users import RoleEnum
+from app.schemas.users_schema import SImportJob, SUserPage
+from app.services.export_service import UserExportService
+from app.services.import_service import ImportJobService, detect_format, save_upload
+from app.services.users_service import UserService
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_roles(RoleEnum.admin))])
+
+
+@router.get("/users")
+async def list_users(
+        role: RoleEnum | None = None,
+        after: int | None = Query(default=None, description="Курсор: next_cursor предыдущей страницы"),
+        limit: int = Query(default=100, ge=1, le=1000),
+        session: AsyncSession = Depends(get_session_read_only),
+) -> SUserPage:
+    """Список пользователей с пагинацией по курсору."""
+    return await UserService(session).list_users(role=role, after=after, limit=limit)
+
+
+@router.get("/users/export")
+async def export_users(role: RoleEnum | None = None) -> StreamingResponse:
+    """Потоковая выгрузка пользователей в формате JSONL."""
+    return StreamingResponse(UserExportService().export_jsonl(role), media_type="application/x-ndjson")
+
+
+@router.post("/users/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_users(file: UploadFile, file_format: Literal["jsonl", "csv"] | None = None) -> SImportJob:
+    """
+    Запуск массового импорта пользователей из JSONL или CSV файла.
+
+    Импорт выполняется в фоне; состояние и отчет возвращает GET /admin/users/import/{job_id}.
+    Размер файла ограничен IMPORT_MAX_UPLOAD_BYTES; большие файлы импортируются через
+    python -m app.cli.import_users.
+    """
+    size = file.size if file.size is not None else file.file.seek(0, io.SEEK_END)
+    if size > settings.IMPORT_MAX_UPLOAD_BYTES:
+        raise ImportFileTooLargeException
+    await file.seek(0)
+    fmt = file_format or detect_format(file.filename or "")
+    # Загруженный файл закрывается по завершении запроса, поэтому импорт читает копию
+    path = await asyncio.to_thread(save_upload, file.file)
+    return await ImportJobService().start(path, fmt)
+
+
+@router.get("/users/import/{job_id}")
+async def get_import_job(job_id: str) -> SImportJob:
+    """Состояние и отчет задачи массового импорта."""
+    job = await ImportJobService().get(job_id)
+    if job is None:
+        raise ImportJobNotFoundException
+    return job
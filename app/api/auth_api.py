@@ -1,32 +1,47 @@
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies.auth_dep import get_current_user
+from app.api.responses import json_response, PRINCIPAL_ADAPTER, TOKEN_ADAPTER, USER_ADAPTER
+from app.dependencies.auth_dep import get_current_user, get_token_payload, throttle_login
 from app.dependencies.repository_dep import get_session_with_commit
-from app.models.users import User
-from app.schemas.users_schema import SUserRegister, SUserBase
+from app.schemas.users_schema import SUserRegister, SUserBase, SUserPrincipal, SRefreshToken, SToken
 from app.services.users_service import UserService
 
 
 router = APIRouter()
 
 
-@router.post("/register")
-async def register(user_data: SUserRegister, session: AsyncSession = Depends(get_session_with_commit)) -> SUserBase:
+@router.post("/register", response_model=SUserBase)
+async def register(user_data: SUserRegister, session: AsyncSession = Depends(get_session_with_commit)) -> Response:
     user_service = UserService(session)
-    return await user_service.create_user(user_data)
+    user = await user_service.create_user(user_data)
+    return json_response(USER_ADAPTER, SUserBase.model_validate(user))
 
 
-@router.post("/login")
+@router.post("/login", response_model=SToken, dependencies=[Depends(throttle_login)])
 async def login(form_data: OAuth2PasswordRequestForm = Depends(),
-                session: AsyncSession = Depends(get_session_with_commit)):
+                session: AsyncSession = Depends(get_session_with_commit)) -> Response:
     user_service = UserService(session)
     token_data = await user_service.login(form_data)
-    return token_data
+    return json_response(TOKEN_ADAPTER, token_data)
+
+
+@router.post("/refresh", response_model=SToken)
+async def refresh(token_data: SRefreshToken, session: AsyncSession = Depends(get_session_with_commit)) -> Response:
+    user_service = UserService(session)
+    return json_response(TOKEN_ADAPTER, await user_service.refresh(token_data.refresh_token))
+
+
+@router.post("/logout", status_code=204)
+async def logout(token_data: SRefreshToken | None = None,
+                 payload: dict = Depends(get_token_payload),
+                 session: AsyncSession = Depends(get_session_with_commit)) -> None:
+    user_service = UserService(session)
+    await user_service.logout(payload, token_data.refresh_token if token_data else None)
 
 
-@router.get("/me")
-async def get_me(user_data: User = Depends(get_current_user)):
-    return user_data
+@router.get("/me", response_model=SUserPrincipal)
+async def get_me(user_data: SUserPrincipal = Depends(get_current_user)) -> Response:
+    # Снимок пользователя построен из данных БД или кеша и уже проверен
+    return json_response(PRINCIPAL_ADAPTER, user_data)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends
+
+from app.core.cache import principal_cache, token_cache
+from app.core.singleflight import user_lookups
+from app.core.throttling import login_throttle
+from app.database.database import engine, pool_stats, replica_set
+from app.dependencies.auth_dep import require_roles
+from app.models.users import RoleEnum
+
+
+# Телеметрия раскрывает топологию БД и состояние защиты входа, поэтому доступна только администраторам
+router = APIRouter(prefix="/internal", dependencies=[Depends(require_roles(RoleEnum.admin))])
+
+
+@router.get("/pool")
+async def get_pool_stats() -> dict:
+    """Состояние пула соединений с БД."""
+    return pool_stats(engine)
+
+
+@router.get("/replicas")
+async def get_replica_stats() -> list[dict]:
+    """Доступность и состояние пулов соединений реплик БД."""
+    return replica_set.stats()
+
+
+@router.get("/caches")
+async def get_cache_stats() -> dict:
+    """Размер и счетчики попаданий кешей аутентификации и объединения поисков пользователя."""
+    return {
+        "principal": principal_cache.stats(),
+        "token": token_cache.stats(),
+        "user_lookups": user_lookups.stats(),
+    }
+
+
+@router.get("/throttle")
+async def get_throttle_stats() -> dict:
+    """Количество попыток входа, отклоненных ограничением частоты."""
+    return {"shed": login_throttle.stats()}
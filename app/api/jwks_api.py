@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Request, Response
+
+from app.core.config import settings
+from app.core.keys import keyring
+
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+async def get_jwks(request: Request) -> Response:
+    """Публичные ключи для локальной проверки подписи токенов другими сервисами."""
+    body, etag = keyring.jwks_document()
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import principal_cache, token_cache
+from app.core.metrics import registry, CallbackMetric
+from app.core.throttling import login_throttle
+from app.database.database import engine, pool_stats
+
+
+router = APIRouter()
+
+registry.register(CallbackMetric(
+    "db_pool_connections", "Соединения пула БД по состоянию",
+    lambda: {(state,): value for state, value in pool_stats(engine).items()
+             if state in ("size", "checked_out", "idle", "overflow")},
+    labels=("state",),
+))
+registry.register(CallbackMetric(
+    "db_pool_checkouts_total", "Выдачи соединений из пула БД",
+    lambda: {(): pool_stats(engine).get("checkout_count", 0)},
+    metric_type="counter",
+))
+registry.register(CallbackMetric(
+    "db_pool_checkout_seconds_total", "Суммарное время выдачи соединений из пула БД",
+    lambda: {(): pool_stats(engine).get("checkout_seconds_total", 0)},
+    metric_type="counter",
+))
+registry.register(CallbackMetric(
+    "db_pool_checkout_seconds_max", "Максимальное время выдачи соединения из пула БД",
+    lambda: {(): pool_stats(engine).get("checkout_seconds_max", 0)},
+))
+registry.register(CallbackMetric(
+    "auth_cache_requests_total", "Обращения к кешам аутентификации",
+    lambda: {
+        (name, result): getattr(cache, result)
+        for name, cache in (("principal", principal_cache), ("token", token_cache))
+        for result in ("hits", "misses")
+    },
+    labels=("cache", "result"),
+    metric_type="counter",
+))
+registry.register(CallbackMetric(
+    "login_throttle_shed_total", "Попытки входа, отклоненные ограничением частоты",
+    lambda: {(scope,): value for scope, value in login_throttle.stats().items()},
+    labels=("scope",),
+    metric_type="counter",
+))
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Метрики сервиса в текстовом формате Prometheus."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
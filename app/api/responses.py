@@ -0,0 +1,26 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.users_schema import SToken, SUserBase, SUserPrincipal
+
+# Сериализаторы ответов строятся один раз при импорте
+TOKEN_ADAPTER = TypeAdapter(SToken)
+USER_ADAPTER = TypeAdapter(SUserBase)
+PRINCIPAL_ADAPTER = TypeAdapter(SUserPrincipal)
+
+
+def json_response(adapter: TypeAdapter, value: Any, status_code: int = 200) -> Response:
+    """
+    Сериализует уже проверенную модель сразу в JSON.
+
+    Ответ возвращается как Response, поэтому FastAPI не выполняет повторную валидацию
+    по response_model и не проходит по данным jsonable_encoder; response_model
+    эндпоинта остается только для схемы OpenAPI.
+
+    :param adapter: Сериализатор модели ответа.
+    :param value: Экземпляр модели ответа.
+    :param status_code: HTTP статус ответа.
+    """
+    return Response(content=adapter.dump_json(value), status_code=status_code, media_type="application/json")
@@ -0,0 +1,88 @@
+"""
+Подбор стоимости хеширования паролей под целевое время проверки на этой машине.
+
+Пример:
+    python -m app.cli.calibrate_hashing --target-ms 250
+    python -m app.cli.calibrate_hashing --scheme pbkdf2_sha256 --target-ms 100 --write .env
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from app.utils import PASSWORD_HASH_SCHEMES, build_crypt_context
+
+# Диапазон стоимости bcrypt (log2 количества итераций)
+BCRYPT_ROUNDS = range(4, 18)
+# Начальное количество итераций pbkdf2 для замера
+PBKDF2_BASE_ROUNDS = 10_000
+
+
+def measure_verify(scheme: str, rounds: int, samples: int) -> float:
+    """
+    Измеряет медианное время проверки пароля.
+
+    :param scheme: Алгоритм хеширования.
+    :param rounds: Стоимость хеширования.
+    :param samples: Количество замеров.
+    :return: Время проверки в секундах.
+    """
+    context = build_crypt_context(scheme, rounds)
+    hashed = context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify("calibration-password", hashed)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(scheme: str, target: float, samples: int) -> tuple[int, float]:
+    """
+    Подбирает максимальную стоимость, при которой проверка укладывается в target.
+
+    :param scheme: Алгоритм хеширования.
+    :param target: Целевое время проверки в секундах.
+    :param samples: Количество замеров для каждой стоимости.
+    :return: Стоимость и измеренное время проверки при ней.
+    """
+    if scheme == "bcrypt":
+        chosen = BCRYPT_ROUNDS[0], measure_verify(scheme, BCRYPT_ROUNDS[0], samples)
+        for rounds in BCRYPT_ROUNDS[1:]:
+            elapsed = measure_verify(scheme, rounds, samples)
+            print(f"bcrypt rounds={rounds}: {elapsed * 1000:.1f} мс")
+            if elapsed > target:
+                break
+            chosen = rounds, elapsed
+        return chosen
+
+    # Время pbkdf2 растет линейно с количеством итераций
+    base = measure_verify(scheme, PBKDF2_BASE_ROUNDS, samples)
+    rounds = max(1000, int(PBKDF2_BASE_ROUNDS * target / base) // 1000 * 1000)
+    return rounds, measure_verify(scheme, rounds, samples)
+
+
+def write_env(path: Path, values: dict[str, str]) -> None:
+    """Записывает значения в env-файл, заменяя существующие строки с теми же ключами."""
+    lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+    lines = [line for line in lines if line.split("=", 1)[0].strip() not in values]
+    lines += [f"{key}={value}" for key, value in values.items()]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Подбор стоимости хеширования паролей")
+    parser.add_argument("--scheme", choices=PASSWORD_HASH_SCHEMES, default="bcrypt", help="Алгоритм хеширования")
+    parser.add_argument("--target-ms", type=float, default=250, help="Целевое время проверки пароля, мс")
+    parser.add_argument("--samples", type=int, default=3, help="Количество замеров для каждой стоимости")
+    parser.add_argument("--write", metavar="ENV_FILE", help="Записать результат в env-файл")
+    args = parser.parse_args()
+
+    rounds, elapsed = calibrate(args.scheme, args.target_ms / 1000, args.samples)
+    values = {"PASSWORD_HASH_SCHEME": args.scheme, "PASSWORD_HASH_ROUNDS": str(rounds)}
+    print(f"Выбрано: {args.scheme}, rounds={rounds}, проверка {elapsed * 1000:.1f} мс")
+    for key, value in values.items():
+        print(f"{key}={value}")
+    if args.write:
+        write_env(Path(args.write), values)
+        print(f"Настройки записаны в {args.write}")
@@ -0,0 +1,57 @@
+"""
+Создание ключа подписи JWT для ротации ключей.
+
+Ключ сохраняется в файл <kid>.pem; kid по умолчанию — текущее время UTC,
+поэтому новый ключ становится активным, если JWT_ACTIVE_KID не задан.
+
+Порядок ротации:
+    1. Создать ключ и задать JWT_ACTIVE_KID=<текущий kid>, чтобы новый ключ
+       опубликовался в JWKS, но еще не использовался для подписи.
+    2. Через JWKS_CACHE_MAX_AGE_SECONDS переключить JWT_ACTIVE_KID на новый kid.
+    3. После истечения срока действия всех токенов, подписанных старым ключом
+       (REFRESH_TOKEN_EXPIRE_DAYS), удалить его файл.
+
+Пример:
+    python -m app.cli.generate_signing_key --dir keys --algorithm RS256
+"""
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+# Кривые ECDSA для алгоритмов ES*
+EC_CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+
+
+def generate_private_key(algorithm: str):
+    """Создает приватный ключ для алгоритма подписи."""
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm in EC_CURVES:
+        return ec.generate_private_key(EC_CURVES[algorithm]())
+    return rsa.generate_private_key(public_exponent=65537, key_size=3072)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Создание ключа подписи JWT")
+    parser.add_argument("--dir", required=True, help="Каталог ключей (JWT_KEYS_DIR)")
+    parser.add_argument("--algorithm", default="RS256",
+                        choices=("RS256", "RS384", "RS512", "PS256", "PS384", "PS512", *EC_CURVES, "EdDSA"),
+                        help="Алгоритм подписи")
+    parser.add_argument("--kid", default=datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+                        help="Идентификатор ключа")
+    args = parser.parse_args()
+
+    path = Path(args.dir) / f"{args.kid}.pem"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pem = generate_private_key(args.algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    with open(path, "xb") as key_file:
+        key_file.write(pem)
+    path.chmod(0o600)
+    print(f"Ключ {args.kid} сохранен в {path}")
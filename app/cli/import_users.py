@@ -0,0 +1,37 @@
+"""
+Массовый импорт пользователей из файла.
+
+Пример:
+    python -m app.cli.import_users users.jsonl
+    python -m app.cli.import_users users.csv --chunk-size 10000
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.database.database import engine
+from app.services.import_service import UserImportService, detect_format
+from app.utils import password_hasher
+
+
+async def main(path: str, fmt: str, chunk_size: int) -> None:
+    service = UserImportService(chunk_size=chunk_size)
+    try:
+        with open(path, encoding="utf-8", newline="") as stream:
+            report = await service.import_stream(stream, fmt)
+    finally:
+        await engine.dispose()
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Массовый импорт пользователей из JSONL/CSV")
+    parser.add_argument("path", help="Путь к файлу с пользователями")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Формат файла (по умолчанию — по расширению)")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE,
+                        help="Количество строк в одной порции")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.path, args.format or detect_format(args.path), args.chunk_size))
+    finally:
+        password_hasher.shutdown()
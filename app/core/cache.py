@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    In-process LRU-кеш с ограничением времени жизни записей.
+
+    Записи вытесняются по LRU при превышении maxsize и считаются отсутствующими
+    по истечении TTL. Кеш рассчитан на работу в одном event loop и не использует
+    блокировки. При maxsize == 0 кеш отключен. Счетчики hits/misses учитывают
+    обращения через get.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: Максимальное количество записей.
+        :param ttl: Время жизни записи по умолчанию, в секундах.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Возвращает значение по ключу и отмечает его как недавно использованное.
+
+        :param key: Ключ записи.
+        :param default: Значение, возвращаемое при отсутствии или истечении записи.
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Сохраняет значение, вытесняя самые старые записи при переполнении.
+
+        :param key: Ключ записи.
+        :param value: Значение.
+        :param ttl: Время жизни записи в секундах (по умолчанию self.ttl).
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись по ключу, если она есть."""
+        self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Удаляет все записи, значения которых удовлетворяют условию.
+
+        :param predicate: Функция, принимающая значение записи.
+        :return: Количество удаленных записей.
+        """
+        keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Возвращает размер кеша и счетчики попаданий/промахов."""
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Снимки аутентифицированных пользователей, ключ — email из поля sub токена
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Проверенные payload JWT токенов, ключ — SHA-256 от строки токена.
+# Время жизни записи определяется полем exp токена.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
@@ -12,6 +12,88 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Ключи для асимметричных алгоритмов (RS256, EdDSA, ...): файлы <kid>.pem в JWT_KEYS_DIR.
+    # Подписывает ключ JWT_ACTIVE_KID (по умолчанию — с наибольшим kid), проверяют все ключи каталога
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    # Время кеширования /.well-known/jwks.json клиентами
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 300
+    # Срок действия refresh токена; каждый refresh токен одноразовый
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Интервал синхронизации списка отозванных токенов с БД
+    REVOCATION_REFRESH_SECONDS: float = 30
+    # Количество процессов для хеширования паролей (None — по числу CPU)
+    PASSWORD_HASH_WORKERS: int | None = None
+    # Паролей в одной задаче пула при массовом хешировании: вход и регистрация ждут не дольше одной задачи
+    PASSWORD_HASH_BATCH_SIZE: int = 8
+    # Алгоритм и стоимость хеширования паролей (см. python -m app.cli.calibrate_hashing).
+    # Хеши с другими параметрами пересчитываются при успешном входе;
+    # при PASSWORD_HASH_ROUNDS=None стоимость существующих хешей не проверяется.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_HASH_ROUNDS: int | None = None
+    # Кеш аутентифицированных пользователей (0 — кеш отключен)
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    # Кеш проверенных JWT токенов (0 — кеш отключен)
+    TOKEN_CACHE_SIZE: int = 10_000
+    # Включать публичный профиль пользователя в claims access токена
+    TOKEN_PROFILE_CLAIMS: bool = False
+    # Количество строк в одной порции массового импорта пользователей
+    IMPORT_CHUNK_SIZE: int = 5000
+    # Максимальный размер файла импорта, загружаемого через API; большие файлы импортируются через CLI
+    IMPORT_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    # Количество строк, читаемых из курсора БД за раз при потоковой выгрузке пользователей
+    EXPORT_CHUNK_SIZE: int = 1000
+    # Пул соединений с БД
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Размер кеша подготовленных выражений asyncpg на соединение (0 — отключен)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Выдача соединения из пула дольше порога пишется в лог предупреждением
+    DB_POOL_WAIT_WARN_SECONDS: float = 0.1
+    # Интервал периодического логирования состояния пула (0 — отключено)
+    DB_POOL_STATS_LOG_INTERVAL_SECONDS: float = 0
+    # Реплики для сессий только для чтения (строки подключения postgresql+asyncpg://...).
+    # Реплика с ошибкой соединения исключается из ротации на DB_REPLICA_EJECT_SECONDS;
+    # при отсутствии доступных реплик чтение идет с основной БД
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_EJECT_SECONDS: float = 30
+    # Логирование: уровень, JSON-формат, неблокирующая запись через очередь,
+    # маскирование email и хешей паролей, доля записываемых сообщений уровня INFO и ниже по логгерам
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_ENQUEUE: bool = True
+    LOG_REDACT_PII: bool = True
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    # Прогрев при старте: открытие соединений пула с подготовкой частых запросов,
+    # запуск процессов хеширования и построение схемы OpenAPI; /ready отвечает 200 только после него.
+    # WARMUP_DB_CONNECTIONS=None — по размеру пула
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int | None = None
+    WARMUP_RETRY_SECONDS: float = 5
+    # Сервер (python -m app). SERVER_WORKERS=None — по числу доступных CPU.
+    # Keep-alive должен превышать таймаут простоя балансировщика перед сервисом.
+    # При SIGTERM /ready сразу отвечает 503, новые запросы принимаются еще SERVER_DRAIN_DELAY_SECONDS,
+    # после чего сервер перестает принимать соединения и ждет текущие запросы до SERVER_GRACEFUL_SHUTDOWN_SECONDS
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None
+    SERVER_KEEP_ALIVE_SECONDS: int = 75
+    SERVER_BACKLOG: int = 2048
+    SERVER_DRAIN_DELAY_SECONDS: float = 0
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: float = 30
+    # Сбор метрик и эндпоинт /metrics в формате Prometheus
+    METRICS_ENABLED: bool = True
+    # Ограничение попыток входа в скользящем окне
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_WINDOW_SECONDS: float = 60
+    LOGIN_ACCOUNT_MAX_ATTEMPTS: int = 10
+    LOGIN_IP_MAX_ATTEMPTS: int = 100
+    # Redis для счетчиков попыток, общих для всех процессов (по умолчанию — в памяти процесса)
+    LOGIN_THROTTLE_REDIS_URL: str | None = None
 
     model_config = SettingsConfigDict(
         env_file=(".env", ".test.env"),
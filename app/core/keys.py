@@ -0,0 +1,122 @@
+import hashlib
+import json
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import get_default_algorithms
+
+from app.core.config import settings
+
+# Алгоритмы подписи, для которых ключи загружаются из JWT_KEYS_DIR и публикуются в JWKS
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "PS256", "PS384", "PS512", "ES256", "ES384", "ES512", "EdDSA")
+
+
+class KeyRing:
+    """
+    Набор ключей подписи JWT.
+
+    Токены подписываются активным ключом, а проверяются любым ключом набора по kid
+    из заголовка токена. Это позволяет вращать ключи с перекрытием: новый ключ
+    публикуется в JWKS до того, как им начинают подписывать, а старый остается
+    в наборе, пока не истекут выпущенные им токены.
+    """
+
+    def __init__(self, algorithm: str, keys: dict[str, object] | None = None,
+                 active_kid: str | None = None, secret: str | None = None):
+        """
+        :param algorithm: Алгоритм подписи.
+        :param keys: Ключи по kid: приватные ключи подписи или публичные ключи только для проверки.
+        :param active_kid: Идентификатор ключа, которым подписываются новые токены.
+        :param secret: Общий секрет для симметричных алгоритмов (HS*).
+        """
+        self.algorithm = algorithm
+        self.secret = secret
+        keys = keys or {}
+        self._private = {kid: key for kid, key in keys.items() if is_private_key(key)}
+        self._public = {kid: key.public_key() if is_private_key(key) else key for kid, key in keys.items()}
+        if secret is None and active_kid not in self._private:
+            raise ValueError(f"Приватный ключ подписи {active_kid!r} не найден")
+        self.active_kid = active_kid
+        self._jwks = self._build_jwks()
+        body = json.dumps(self._jwks, separators=(",", ":")).encode()
+        self._jwks_document = body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.secret is None
+
+    def signing_key(self) -> tuple[str | None, object]:
+        """Возвращает kid и ключ для подписи новых токенов."""
+        if not self.is_asymmetric:
+            return None, self.secret
+        return self.active_kid, self._private[self.active_kid]
+
+    def verification_key(self, token: str) -> object:
+        """
+        Возвращает ключ для проверки подписи токена по kid из его заголовка.
+
+        :raises jwt.InvalidTokenError: Если kid отсутствует или неизвестен.
+        """
+        if not self.is_asymmetric:
+            return self.secret
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._public.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+    def _build_jwks(self) -> dict:
+        if not self.is_asymmetric:
+            return {"keys": []}
+        algorithm = get_default_algorithms()[self.algorithm]
+        keys = []
+        for kid, public_key in sorted(self._public.items()):
+            jwk = algorithm.to_jwk(public_key, as_dict=True)
+            jwk.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(jwk)
+        return {"keys": keys}
+
+    def jwks(self) -> dict:
+        """Публичные ключи набора в формате JWKS (RFC 7517)."""
+        return self._jwks
+
+    def jwks_document(self) -> tuple[bytes, str]:
+        """Сериализованный JWKS и его ETag; набор ключей неизменен, поэтому вычисляются один раз."""
+        return self._jwks_document
+
+
+def is_private_key(key: object) -> bool:
+    """Проверяет, является ли ключ приватным (пригодным для подписи)."""
+    return hasattr(key, "public_key")
+
+
+def load_key(path: Path) -> object:
+    """Загружает приватный или публичный ключ из PEM файла."""
+    data = path.read_bytes()
+    if b"PUBLIC KEY" in data:
+        return serialization.load_pem_public_key(data)
+    return serialization.load_pem_private_key(data, password=None)
+
+
+def load_keyring() -> KeyRing:
+    """
+    Создает набор ключей по настройкам.
+
+    Для асимметричных алгоритмов ключи читаются из файлов JWT_KEYS_DIR/<kid>.pem.
+    Активный ключ задается JWT_ACTIVE_KID, по умолчанию — приватный ключ
+    с наибольшим kid (см. python -m app.cli.generate_signing_key).
+    """
+    if settings.ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        return KeyRing(settings.ALGORITHM, secret=settings.SECRET_KEY)
+    if settings.JWT_KEYS_DIR is None:
+        raise ValueError(f"Для алгоритма {settings.ALGORITHM} необходимо задать JWT_KEYS_DIR")
+
+    keys = {path.stem: load_key(path) for path in sorted(Path(settings.JWT_KEYS_DIR).glob("*.pem"))}
+    active_kid = settings.JWT_ACTIVE_KID
+    if active_kid is None:
+        active_kid = max((kid for kid, key in keys.items() if is_private_key(key)), default=None)
+    return KeyRing(settings.ALGORITHM, keys=keys, active_kid=active_kid)
+
+
+keyring = load_keyring()
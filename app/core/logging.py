@@ -0,0 +1,70 @@
+import re
+import sys
+
+from loguru import logger
+
+from app.core.config import settings
+
+EMAIL_PATTERN = re.compile(r"([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})")
+PASSWORD_HASH_PATTERN = re.compile(r"\$(2[abxy]|pbkdf2-sha256)\$[^\s'\",}]+")
+# Уровень WARNING и выше не прореживается
+SAMPLING_MAX_LEVEL = logger.level("INFO").no
+
+
+def redact(text: str) -> str:
+    """Маскирует email и хеши паролей в тексте."""
+    text = EMAIL_PATTERN.sub(r"\1***@\2", text)
+    return PASSWORD_HASH_PATTERN.sub("<password hash>", text)
+
+
+def _redact_record(record: dict) -> None:
+    record["message"] = redact(record["message"])
+    for key, value in record["extra"].items():
+        if isinstance(value, str):
+            record["extra"][key] = redact(value)
+
+
+class SamplingFilter:
+    """
+    Пропускает только каждое n-е сообщение уровня INFO и ниже для логгеров из rates.
+
+    Логгер сопоставляется по префиксу имени модуля, например "app.repositories".
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        self.every = {name: max(1, round(1 / rate)) if rate > 0 else 0 for name, rate in rates.items()}
+        self.counters = dict.fromkeys(rates, 0)
+
+    def __call__(self, record: dict) -> bool:
+        if not self.every or record["level"].no > SAMPLING_MAX_LEVEL:
+            return True
+        name = record["name"] or ""
+        for prefix, every in self.every.items():
+            if name == prefix or name.startswith(prefix + "."):
+                if not every:
+                    return False
+                self.counters[prefix] += 1
+                return (self.counters[prefix] - 1) % every == 0
+        return True
+
+
+def setup_logging() -> None:
+    """
+    Настраивает loguru согласно настройкам.
+
+    Запись выполняется в отдельном потоке через очередь (LOG_ENQUEUE), поэтому
+    обработчик запроса не ждет вывода. Сообщения ниже LOG_LEVEL отбрасываются
+    до форматирования: используйте logger.debug("... {}", value) вместо f-строк.
+    """
+    logger.remove()
+    if settings.LOG_REDACT_PII:
+        logger.configure(patcher=_redact_record)
+    logger.add(
+        sys.stderr,
+        level=settings.LOG_LEVEL,
+        serialize=settings.LOG_JSON,
+        enqueue=settings.LOG_ENQUEUE,
+        filter=SamplingFilter(settings.LOG_SAMPLE_RATES),
+        backtrace=False,
+        diagnose=False,
+    )
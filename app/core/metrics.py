@@ -0,0 +1,245 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Границы корзин гистограмм задержек, в секундах
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Значение меток для рядов сверх лимита max_series
+OVERFLOW_LABEL = "__other__"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """
+    Базовый класс метрики в формате Prometheus.
+
+    Количество рядов (комбинаций значений меток) ограничено max_series:
+    новые комбинации сверх лимита учитываются в ряду с метками OVERFLOW_LABEL.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), max_series: int = 100):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.max_series = max_series
+        self._series: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: tuple[str, ...]) -> tuple[str, ...]:
+        if labels in self._series or len(self._series) < self.max_series:
+            return labels
+        return (OVERFLOW_LABEL,) * len(self.label_names)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.type}\n"
+        return header + "".join(f"{line}\n" for line in self.samples())
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._series.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._series[self._key(labels)] = value
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._series.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+
+class CallbackMetric(Metric):
+    """Метрика, значения которой вычисляются функцией в момент сбора метрик."""
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], dict],
+                 labels: Iterable[str] = (), metric_type: str = "gauge"):
+        """
+        :param callback: Функция, возвращающая словарь {кортеж значений меток: значение}.
+        :param metric_type: Тип метрики: "gauge" или "counter".
+        """
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+        self.type = metric_type
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self.callback().items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS, max_series: int = 100):
+        super().__init__(name, documentation, labels, max_series)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # Счетчики по корзинам (последняя — +Inf), сумма и количество наблюдений
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+class Timer:
+    """Контекстный менеджер, записывающий длительность блока в гистограмму."""
+
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, *labels: str):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "Длительность обработки HTTP-запроса", labels=("method", "route", "status"),
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "Количество HTTP-запросов в обработке",
+))
+DB_STATEMENT_DURATION = registry.register(Histogram(
+    "db_statement_duration_seconds", "Длительность выполнения SQL-выражения", labels=("operation",),
+))
+DB_STATEMENT_ERRORS = registry.register(Counter(
+    "db_statement_errors_total", "Количество ошибок выполнения SQL-выражений",
+))
+PASSWORD_HASH_DURATION = registry.register(Histogram(
+    "password_hash_duration_seconds", "Длительность хеширования и проверки пароля, включая ожидание пула",
+    labels=("operation",), buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+))
+JWT_DURATION = registry.register(Histogram(
+    "jwt_duration_seconds", "Длительность формирования и проверки подписи JWT", labels=("operation",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, измеряющее длительность HTTP-запросов.
+
+    Метка route — шаблон пути маршрута (например, /users/{user_id}), а не фактический путь,
+    поэтому количество рядов ограничено количеством маршрутов.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                str(status_code),
+            )
+
+
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    """Подключает сбор длительности и ошибок SQL-выражений к движку."""
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        operation = statement.lstrip()[:6].upper()
+        if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            operation = "OTHER"
+        DB_STATEMENT_DURATION.observe(time.perf_counter() - started, operation)
+
+    @event.listens_for(async_engine.sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        started = exception_context.connection.info.get("metrics_started") if exception_context.connection else None
+        if started:
+            started.pop()
+        DB_STATEMENT_ERRORS.inc()
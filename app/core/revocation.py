@@ -0,0 +1,33 @@
+import time
+
+
+class RevocationList:
+    """
+    Множество отозванных токенов в памяти процесса.
+
+    Проверка выполняется за O(1) без обращения к БД. Источник истины — таблица
+    revoked_tokens: токены, отозванные в этом процессе, добавляются сразу, а отозванные
+    другими процессами подгружаются периодической синхронизацией.
+    """
+
+    def __init__(self):
+        # jti -> время истечения токена (unix time)
+        self._revoked: dict[str, float] = {}
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._revoked[jti] = expires_at
+
+    def is_revoked(self, jti: str | None) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def replace(self, entries: dict[str, float]) -> None:
+        """Заменяет содержимое данными из БД, сохраняя локальные записи, еще не попавшие в выборку."""
+        now = time.time()
+        local = {jti: exp for jti, exp in self._revoked.items() if exp > now and jti not in entries}
+        self._revoked = {**entries, **local}
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_list = RevocationList()
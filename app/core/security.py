@@ -1,8 +1,22 @@
+import hashlib
+import time
+import uuid
 from datetime import timedelta, datetime, timezone
 
 import jwt
 
+from app.core.cache import token_cache
 from app.core.config import settings
+from app.core.keys import keyring
+from app.core.metrics import JWT_DURATION, Timer
+from app.models.users import RoleEnum
+from app.schemas.users_schema import SUserPrincipal
+
+# Значение claim type у refresh токенов; access токены этого claim не содержат
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Claims, необходимые для построения пользователя без обращения к БД
+PROFILE_CLAIMS = ("uid", "sub", "first_name", "last_name", "role", "pv")
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -11,6 +25,115 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    kid, key = keyring.signing_key()
+    with Timer(JWT_DURATION, "encode"):
+        encoded_jwt = jwt.encode(to_encode, key, algorithm=keyring.algorithm, headers={"kid": kid} if kid else None)
     return encoded_jwt
+
+
+def create_refresh_token(email: str) -> str:
+    """
+    Выпускает одноразовый refresh токен.
+
+    :param email: Email пользователя.
+    :return: JWT токен с claim type=refresh и уникальным jti.
+    """
+    return create_access_token(
+        data={"sub": email, "type": REFRESH_TOKEN_TYPE},
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Проверяет подпись JWT токена и возвращает его payload.
+
+    Результат проверки кешируется по SHA-256 от токена до момента истечения exp,
+    поэтому подпись повторно присылаемого токена проверяется один раз.
+    Возвращаемый словарь общий для всех обращений и не должен изменяться.
+
+    :param token: JWT токен.
+    :return: Payload токена.
+    :raises jwt.InvalidTokenError: Если токен невалиден, просрочен или является refresh токеном.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    with Timer(JWT_DURATION, "decode"):
+        payload = jwt.decode(token, keyring.verification_key(token), algorithms=[keyring.algorithm])
+    exp = payload.get("exp")
+    if payload.get("type") == REFRESH_TOKEN_TYPE:
+        raise jwt.InvalidTokenError("Refresh token cannot be used as access token")
+    token_cache.set(key, payload, ttl=exp - time.time() if exp is not None else None)
+    return payload
+
+
+def decode_refresh_token(token: str) -> dict:
+    """
+    Проверяет подпись refresh токена и возвращает его payload.
+
+    Refresh токен одноразовый, поэтому результат не кешируется.
+
+    :param token: JWT токен.
+    :return: Payload токена.
+    :raises jwt.InvalidTokenError: Если токен невалиден, просрочен или не является refresh токеном.
+    """
+    with Timer(JWT_DURATION, "decode"):
+        payload = jwt.decode(
+            token, keyring.verification_key(token), algorithms=[keyring.algorithm],
+            options={"require": ["exp", "jti", "sub"]},
+        )
+    if payload.get("type") != REFRESH_TOKEN_TYPE:
+        raise jwt.InvalidTokenError("Not a refresh token")
+    return payload
+
+
+def profile_version(principal: SUserPrincipal) -> str:
+    """
+    Вычисляет версию публичного профиля пользователя.
+
+    Версия меняется при изменении любого поля профиля, что позволяет обнаружить
+    токены, выпущенные до изменения.
+
+    :param principal: Снимок пользователя.
+    :return: Короткий hex-дайджест полей профиля.
+    """
+    data = "\x1f".join(
+        (str(principal.id), principal.email, principal.first_name, principal.last_name, principal.role.value)
+    )
+    return hashlib.blake2b(data.encode(), digest_size=8).hexdigest()
+
+
+def profile_claims(principal: SUserPrincipal) -> dict:
+    """Формирует claims токена с публичным профилем пользователя."""
+    return {
+        "sub": principal.email,
+        "uid": principal.id,
+        "first_name": principal.first_name,
+        "last_name": principal.last_name,
+        "role": principal.role.value,
+        "pv": profile_version(principal),
+    }
+
+
+def principal_from_claims(payload: dict) -> SUserPrincipal | None:
+    """
+    Строит снимок пользователя из claims проверенного токена.
+
+    Повторная валидация не выполняется: подпись токена уже проверена.
+
+    :param payload: Payload токена.
+    :return: Снимок пользователя или None, если в токене нет профиля.
+    """
+    if not all(claim in payload for claim in PROFILE_CLAIMS):
+        return None
+    return SUserPrincipal.model_construct(
+        id=payload["uid"],
+        email=payload["sub"],
+        first_name=payload["first_name"],
+        last_name=payload["last_name"],
+        role=RoleEnum(payload["role"]),
+    )
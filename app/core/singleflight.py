@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых асинхронных вызовов.
+
+    Пока вызов с ключом выполняется, остальные вызовы с тем же ключом не запускают
+    свой, а ждут его результат или исключение. Запись о ключе удаляется сразу после
+    завершения вызова, поэтому результаты не кешируются и не устаревают. Если первый
+    вызов отменен, ожидающие выполняют запрос заново. Рассчитан на работу в одном
+    event loop и не использует блокировки.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет fn или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        :param key: Ключ вызова.
+        :param fn: Фабрика корутины, выполняющей вызов.
+        :return: Результат вызова.
+        """
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            # wait не отменяет общий вызов при отмене ожидающего
+            await asyncio.wait((future,))
+            if not future.cancelled():
+                return future.result()
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.calls += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Помечаем исключение как полученное, если ожидающих нет
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        """Возвращает число выполняющихся, выполненных и объединенных вызовов."""
+        return {"in_flight": len(self._calls), "calls": self.calls, "coalesced": self.coalesced}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+# Одновременные поиски пользователя, ключ — (email в нижнем регистре, столбцы)
+user_lookups = SingleFlight()
@@ -0,0 +1,160 @@
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.config import settings
+from app.exceptions import TooManyLoginAttemptsException
+
+
+class ThrottleBackend(ABC):
+    """Хранилище счетчиков попыток в скользящем окне."""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Регистрирует попытку, если лимит в окне не исчерпан.
+
+        :param key: Ключ счетчика.
+        :param limit: Допустимое количество попыток в окне.
+        :param window: Длина окна в секундах.
+        :return: 0, если попытка разрешена, иначе количество секунд до освобождения места в окне.
+        """
+        raise NotImplementedError
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """
+    Счетчики в памяти процесса.
+
+    Хранит отметки времени попыток по каждому ключу; количество ключей ограничено
+    max_keys, при переполнении вытесняются давно не использованные.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return hits[0] + window - now
+        hits.append(now)
+        return 0
+
+
+class RedisThrottleBackend(ThrottleBackend):
+    """
+    Счетчики в Redis, общие для всех процессов и экземпляров сервиса.
+
+    Окно хранится в sorted set; проверка и регистрация выполняются атомарно одним
+    Lua-скриптом. Подходит любой асинхронный клиент с методом eval, совместимым с redis-py.
+    """
+
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return tostring(tonumber(oldest[2]) + window - now)
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        retry_after = await self.client.eval(
+            self.SCRIPT, 1, key, time.time(), window, limit, uuid.uuid4().hex
+        )
+        return float(retry_after)
+
+
+class LoginThrottle:
+    """
+    Ограничение попыток входа по учетной записи и по IP-адресу клиента.
+
+    Проверка выполняется до обращения к БД и проверки пароля, поэтому отклоненные
+    попытки не расходуют ни соединения, ни процессорное время на bcrypt.
+    """
+
+    def __init__(self, backend: ThrottleBackend, account_limit: int, ip_limit: int, window: float):
+        """
+        :param backend: Хранилище счетчиков.
+        :param account_limit: Допустимое количество попыток для одной учетной записи в окне.
+        :param ip_limit: Допустимое количество попыток с одного IP-адреса в окне.
+        :param window: Длина окна в секундах.
+        """
+        self.backend = backend
+        self.account_limit = account_limit
+        self.ip_limit = ip_limit
+        self.window = window
+        self.shed = {"ip": 0, "account": 0}
+
+    async def check(self, username: str, client_ip: str | None) -> None:
+        """
+        Регистрирует попытку входа или отклоняет ее при превышении лимита.
+
+        При недоступности хранилища попытка пропускается, чтобы не блокировать вход.
+
+        :param username: Email, указанный при входе.
+        :param client_ip: IP-адрес клиента.
+        :raises HTTPException: 429 TOO MANY REQUESTS с заголовком Retry-After.
+        """
+        checks = [("account", f"login:account:{username.strip().lower()}", self.account_limit)]
+        if client_ip:
+            checks.insert(0, ("ip", f"login:ip:{client_ip}", self.ip_limit))
+        for scope, key, limit in checks:
+            try:
+                retry_after = await self.backend.hit(key, limit, self.window)
+            except Exception as e:
+                logger.error("Login throttle backend error: {}", e)
+                return
+            if retry_after > 0:
+                self.shed[scope] += 1
+                logger.warning("Login attempt throttled by {}: {}", scope, key)
+                raise HTTPException(
+                    status_code=TooManyLoginAttemptsException.status_code,
+                    detail=TooManyLoginAttemptsException.detail,
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+    def stats(self) -> dict:
+        """Количество отклоненных попыток по IP-адресу и по учетной записи."""
+        return dict(self.shed)
+
+
+def create_throttle_backend() -> ThrottleBackend:
+    """Создает хранилище счетчиков согласно настройкам."""
+    if not settings.LOGIN_THROTTLE_REDIS_URL:
+        return InMemoryThrottleBackend()
+    try:
+        from redis.asyncio import Redis
+    except ImportError as e:
+        raise RuntimeError("Для LOGIN_THROTTLE_REDIS_URL требуется пакет redis") from e
+    return RedisThrottleBackend(Redis.from_url(settings.LOGIN_THROTTLE_REDIS_URL))
+
+
+login_throttle = LoginThrottle(
+    backend=create_throttle_backend(),
+    account_limit=settings.LOGIN_ACCOUNT_MAX_ATTEMPTS,
+    ip_limit=settings.LOGIN_IP_MAX_ATTEMPTS,
+    window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+)
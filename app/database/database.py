@@ -1,6 +1,248 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import itertools
+import time
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy import AsyncAdaptedQueuePool, Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
+from sqlalchemy.orm import Session, ORMExecuteState
+from sqlalchemy.sql.elements import TextClause
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, измеряющий время выдачи соединения.
+
+    Время выдачи включает ожидание свободного соединения и установку нового,
+    поэтому учитываются все выдачи, а не только те, что ждали освобождения.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_count = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checkout_count += 1
+            self.checkout_seconds_total += elapsed
+            self.checkout_seconds_max = max(self.checkout_seconds_max, elapsed)
+            if elapsed >= settings.DB_POOL_WAIT_WARN_SECONDS:
+                logger.warning("Выдача соединения из пула заняла {:.3f} с: {}", elapsed, self.status())
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Создает асинхронный движок с параметрами пула из настроек.
+
+    :param url: Строка подключения к базе данных.
+    :return: Асинхронный движок SQLAlchemy.
+    """
+    return create_async_engine(
+        url=url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+def pool_stats(async_engine: AsyncEngine) -> dict:
+    """
+    Возвращает текущее состояние пула соединений движка.
+
+    :param async_engine: Асинхронный движок SQLAlchemy.
+    :return: Словарь с размером пула, количеством выданных, свободных и
+             overflow-соединений и статистикой времени выдачи соединения.
+    """
+    pool = async_engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            checkout_count=pool.checkout_count,
+            checkout_seconds_total=round(pool.checkout_seconds_total, 6),
+            checkout_seconds_avg=(
+                round(pool.checkout_seconds_total / pool.checkout_count, 6) if pool.checkout_count else 0.0
+            ),
+            checkout_seconds_max=round(pool.checkout_seconds_max, 6),
+        )
+    return stats
+
+
+class ReplicaSet:
+    """
+    Набор реплик БД для чтения с выбором по кругу.
+
+    Реплика, на которой произошла ошибка соединения, исключается из ротации на
+    eject_seconds, после чего снова получает запросы.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], eject_seconds: float):
+        """
+        :param engines: Движки реплик.
+        :param eject_seconds: Время исключения реплики после ошибки соединения.
+        """
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        # Синхронные движки сессий только для чтения: AUTOCOMMIT, как у основной БД
+        self._binds = [replica.execution_options(isolation_level="AUTOCOMMIT").sync_engine for replica in engines]
+        self._ejected_until: dict[int, float] = {}
+        self._counter = itertools.count()
+        for index, replica in enumerate(engines):
+            event.listen(replica.sync_engine, "handle_error", self._make_error_handler(index))
+
+    def _make_error_handler(self, index: int):
+        def handle_error(context: ExceptionContext) -> None:
+            # Ошибка установки соединения или разрыв — признак недоступной реплики
+            if context.is_disconnect or context.connection is None:
+                self.eject(index)
+        return handle_error
+
+    def eject(self, index: int) -> None:
+        """Исключает реплику из ротации на eject_seconds."""
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Реплика {} исключена из ротации на {} с",
+            self.engines[index].url.render_as_string(hide_password=True), self.eject_seconds,
+        )
+
+    def choose(self) -> Engine | None:
+        """Возвращает следующую доступную реплику или None, если доступных реплик нет."""
+        now = time.monotonic()
+        for _ in range(len(self._binds)):
+            index = next(self._counter) % len(self._binds)
+            if self._ejected_until.get(index, 0) <= now:
+                return self._binds[index]
+        return None
+
+    def stats(self) -> list[dict]:
+        """Состояние реплик: доступность и пул соединений."""
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._ejected_until.get(index, 0) <= now,
+                "pool": pool_stats(replica),
+            }
+            for index, replica in enumerate(self.engines)
+        ]
+
+
+class TrackedSession(Session):
+    """
+    Сессия, отмечающая, выполнялись ли в ней изменения данных.
+
+    Сессия с info["read_only"] отклоняет изменения через ORM и текстовые запросы, кроме
+    SELECT/SHOW/EXPLAIN, и, если настроены реплики, читает с одной из них; остальные
+    сессии работают с основной БД, поэтому чтение внутри транзакции с изменениями
+    видит собственные записи.
+    """
+
+    _replica_bind: Engine | None = None
+
+    @property
+    def has_writes(self) -> bool:
+        return self.info.get("has_writes", False)
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self.info.get("read_only") and replica_set.engines:
+            # Реплика выбирается один раз на сессию: все запросы сессии идут через одно соединение
+            if self._replica_bind is None:
+                self._replica_bind = replica_set.choose()
+            if self._replica_bind is not None:
+                return self._replica_bind
+        return super().get_bind(mapper, **kwargs)
+
+
+# Текстовые запросы, начинающиеся с этих слов, только читают данные; остальные считаются изменениями
+READ_ONLY_TEXT_PREFIXES = ("select", "show", "explain")
+
+
+def _is_text_write(statement) -> bool:
+    return isinstance(statement, TextClause) and not statement.text.lstrip().lower().startswith(READ_ONLY_TEXT_PREFIXES)
+
+
+def _mark_write(session: Session) -> None:
+    if session.info.get("read_only"):
+        raise InvalidRequestError("Изменение данных в сессии только для чтения")
+    session.info["has_writes"] = True
+
+
+def on_commit(session: Session | AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Откладывает вызов callback до успешного коммита транзакции сессии.
+
+    Подходит для обновления состояния процесса (кешей, списков в памяти) по изменениям
+    в БД: при откате транзакции callback не вызывается.
+
+    :param session: Сессия, в транзакции которой выполнено изменение.
+    :param callback: Функция без аргументов.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _on_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", ()):
+        try:
+            callback()
+        except Exception as e:
+            logger.error("Ошибка обработчика коммита {}: {}", callback, e)
+
+
+@event.listens_for(TrackedSession, "after_transaction_end")
+def _on_after_transaction_end(session: Session, transaction) -> None:
+    # Транзакция завершена без коммита: отложенные обработчики не выполняются
+    if transaction.parent is None:
+        session.info.pop("after_commit", None)
+
+
+@event.listens_for(TrackedSession, "before_flush")
+def _on_before_flush(session: Session, flush_context, instances) -> None:
+    if session.new or session.dirty or session.deleted:
+        _mark_write(session)
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _on_do_orm_execute(orm_execute_state: ORMExecuteState) -> None:
+    if (
+            orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+            or _is_text_write(orm_execute_state.statement)
+    ):
+        _mark_write(orm_execute_state.session)
+
 
-engine = create_async_engine(url=settings.get_db_url_async)
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+engine = create_engine(settings.get_db_url_async)
+instrument_engine(engine)
+replica_set = ReplicaSet([create_engine(url) for url in settings.DB_REPLICA_URLS], settings.DB_REPLICA_EJECT_SECONDS)
+for replica in replica_set.engines:
+    instrument_engine(replica)
+async_session_maker = async_sessionmaker(
+    engine, class_=AsyncSession, sync_session_class=TrackedSession, expire_on_commit=False
+)
+# Сессии только для чтения работают в режиме AUTOCOMMIT: без BEGIN и ROLLBACK вокруг запросов
+async_session_maker_read_only = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    sync_session_class=TrackedSession,
+    expire_on_commit=False,
+    info={"read_only": True},
+)
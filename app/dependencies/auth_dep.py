@@ -1,45 +1,93 @@
-import jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from jwt.exceptions import InvalidTokenError
 from loguru import logger
 
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.dependencies.repository_dep import get_session_without_commit
-from app.models.users import User
+from app.core.revocation import revocation_list
+from app.core.security import decode_access_token, principal_from_claims, profile_version
+from app.core.throttling import login_throttle
+from app.dependencies.repository_dep import get_session_read_only
+from app.exceptions import ForbiddenException, TokenRevokedException
+from app.models.users import RoleEnum
+from app.schemas.users_schema import SUserPrincipal, PRINCIPAL_COLUMNS
 from app.services.users_service import UserService
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Роли, права которых непосредственно включает роль
+ROLE_INHERITS = {
+    RoleEnum.admin: (RoleEnum.doctor,),
+    RoleEnum.doctor: (RoleEnum.patient,),
+    RoleEnum.patient: (),
+}
+
+
+def _granted_roles(role: RoleEnum) -> frozenset[RoleEnum]:
+    granted = {role}
+    for inherited in ROLE_INHERITS[role]:
+        granted |= _granted_roles(inherited)
+    return frozenset(granted)
+
+
+# Все роли, права которых есть у роли, с учетом иерархии
+GRANTED_ROLES = {role: _granted_roles(role) for role in RoleEnum}
+
+
+async def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    """Проверяет access токен и возвращает его payload.
+
+    Отзыв токена проверяется по списку отозванных токенов в памяти процесса,
+    без обращения к БД.
+
+    Raises:
+        HTTPException: 401 UNAUTHORIZED если токен невалиден, просрочен или отозван.
+    """
+    try:
+        payload = decode_access_token(token)
+    except InvalidTokenError as err:
+        logger.error("Invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from err
+    if revocation_list.is_revoked(payload.get("jti")):
+        logger.warning("Revoked token presented")
+        raise TokenRevokedException
+    return payload
+
 
 async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        session: AsyncSession = Depends(get_session_without_commit),
-) -> User:
+        payload: dict = Depends(get_token_payload),
+        session: AsyncSession = Depends(get_session_read_only),
+) -> SUserPrincipal:
     """Получает текущего аутентифицированного пользователя по JWT токену.
 
-    Проверяет валидность JWT токена, декодирует email из payload и ищет пользователя в БД.
-    Если токен невалиден или пользователь не найден, возвращает HTTP 401.
+    Проверяет валидность JWT токена, декодирует email из payload и ищет пользователя
+    сначала в кеше снимков, затем в БД. Если токен невалиден или пользователь не найден,
+    возвращает HTTP 401.
 
     Args:
-        token (str): JWT токен из заголовка Authorization (Bearer token).
-        session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        payload (dict): Payload проверенного и не отозванного JWT токена.
+        session (AsyncSession): Асинхронная сессия SQLAlchemy только для чтения.
 
     Returns:
-        User: Объект пользователя из БД.
+        SUserPrincipal: Снимок пользователя без пароля.
 
     Raises:
         HTTPException: 401 UNAUTHORIZED если:
-            - токен невалиден/просрочен
+            - токен невалиден/просрочен/отозван
             - email не найден в payload
             - пользователь не существует в БД
 
     Examples:
         >>> # В зависимостях эндпоинта:
         >>> @app.get("/me")
-        >>> async def read_current_user(user: User = Depends(get_current_user)):
+        >>> async def read_current_user(user: SUserPrincipal = Depends(get_current_user)):
         >>>     return user
     """
     credentials_exception = HTTPException(
@@ -47,21 +95,104 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        logger.info(f"Decoded payload: {payload}")
-        email: str = payload.get("sub")
-        if email is None:
-            logger.error("Email not found in token payload")
+    logger.opt(lazy=True).debug("Decoded token claims: {}", lambda: sorted(payload))
+    email: str = payload.get("sub")
+    if email is None:
+        logger.error("Email not found in token payload")
+        raise credentials_exception
+
+    principal = principal_cache.get(email)
+    if principal is None:
+        user_service = UserService(session)
+        user = await user_service.get_user_by_email(email, columns=PRINCIPAL_COLUMNS)
+        if not user:
+            logger.error("User with email {} not found", email)
             raise credentials_exception
-    except InvalidTokenError as err:
-        logger.error(f"Invalid token")
-        raise credentials_exception from err
 
-    user_service = UserService(session)
-    user = await user_service.get_user_by_email(email)
-    if not user:
-        logger.error(f"User with email {email} not found")
+        principal = SUserPrincipal.model_validate(user)
+        principal_cache.set(email, principal)
+
+    version = payload.get("pv")
+    if version is not None and version != profile_version(principal):
+        logger.error("Token profile claims are stale")
         raise credentials_exception
 
-    return user
+    return principal
+
+
+async def get_current_user_from_claims(payload: dict = Depends(get_token_payload)) -> SUserPrincipal:
+    """Получает текущего пользователя только из claims JWT токена, без обращения к БД.
+
+    Предназначена для эндпоинтов на чтение: пользователь строится из профиля,
+    выпущенного в токене при TOKEN_PROFILE_CLAIMS. Изменения профиля после выпуска
+    токена не видны до его истечения, поэтому для чувствительных операций
+    используйте get_current_user.
+
+    Args:
+        payload (dict): Payload проверенного и не отозванного JWT токена.
+
+    Returns:
+        SUserPrincipal: Снимок пользователя из claims токена.
+
+    Raises:
+        HTTPException: 401 UNAUTHORIZED если токен невалиден, отозван или не содержит профиля.
+    """
+    principal = principal_from_claims(payload)
+    if principal is None:
+        logger.error("Profile claims not found in token payload")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
+def require_roles(*roles: RoleEnum, inherit: bool = True):
+    """Фабрика зависимости, разрешающей доступ только указанным ролям.
+
+    Роль берется из claims проверенного и не отозванного токена, без обращения к БД,
+    поэтому запрос с недостаточными правами отклоняется до открытия сессии.
+    Изменение роли пользователя учитывается после перевыпуска токена.
+
+    Подходит для значений по умолчанию на уровне роутера:
+        APIRouter(prefix="/admin", dependencies=[Depends(require_roles(RoleEnum.admin))])
+
+    Args:
+        *roles (RoleEnum): Роли, которым разрешен доступ.
+        inherit (bool): Учитывать иерархию ролей: роль получает доступ и к эндпоинтам
+            ролей, права которых она включает (admin > doctor > patient).
+
+    Returns:
+        Зависимость, возвращающая payload токена.
+
+    Raises:
+        HTTPException: 401 UNAUTHORIZED если токен невалиден или отозван;
+            403 FORBIDDEN если роль пользователя не разрешена.
+    """
+    allowed = frozenset(roles)
+
+    async def check_roles(payload: dict = Depends(get_token_payload)) -> dict:
+        try:
+            role = RoleEnum(payload.get("role"))
+        except ValueError:
+            logger.warning("Forbidden: token without a valid role for {}", payload.get("sub"))
+            raise ForbiddenException
+        granted = GRANTED_ROLES[role] if inherit else {role}
+        if allowed.isdisjoint(granted):
+            logger.warning("Forbidden: role {} of {} is not in {}", role.value, payload.get("sub"), sorted(allowed))
+            raise ForbiddenException
+        return payload
+
+    return check_roles
+
+
+async def throttle_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    """Ограничивает частоту попыток входа до проверки учетных данных.
+
+    Raises:
+        HTTPException: 429 TOO MANY REQUESTS с заголовком Retry-After, если превышен лимит
+            попыток для учетной записи или IP-адреса клиента.
+    """
+    if settings.LOGIN_THROTTLE_ENABLED:
+        await login_throttle.check(form_data.username, request.client.host if request.client else None)
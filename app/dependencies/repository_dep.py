@@ -1,17 +1,23 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.database import async_session_maker
+from app.database.database import async_session_maker, async_session_maker_read_only
+
+# Соединение из пула берется сессией только при первом запросе к БД,
+# поэтому обработчик, завершившийся до обращения к БД, не занимает соединение.
 
 
 async def get_session_with_commit() -> AsyncGenerator[AsyncSession, None]:
-    """Асинхронная сессия с автоматическим коммитом."""
+    """Асинхронная сессия с коммитом, если в ней были изменения данных."""
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            # Учитываются и объекты, добавленные или измененные без flush
+            if session.sync_session.has_writes or session.new or session.dirty or session.deleted:
+                await session.commit()
         except Exception:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise
         finally:
             await session.close()
@@ -23,7 +29,14 @@ async def get_session_without_commit() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         except Exception:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_session_read_only() -> AsyncGenerator[AsyncSession, None]:
+    """Асинхронная сессия только для чтения, без транзакции и коммита."""
+    async with async_session_maker_read_only() as session:
+        yield session
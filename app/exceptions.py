@@ -62,8 +62,32 @@ ForbiddenException = HTTPException(
     detail='Недостаточно прав'
 )
 
+# Слишком много попыток входа
+TooManyLoginAttemptsException = HTTPException(
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    detail='Слишком много попыток входа. Повторите позже'
+)
+
 # Неверный формат токена. Ожидается 'Bearer <токен>'
 TokenInvalidFormatException = HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Неверный формат токена. Ожидается 'Bearer <токен>'"
-)
\ No newline at end of file
+)
+# Токен отозван
+TokenRevokedException = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail='Токен отозван',
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+# Файл импорта превышает допустимый для загрузки через API размер
+ImportFileTooLargeException = HTTPException(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail='Файл слишком большой для импорта через API. Используйте python -m app.cli.import_users',
+)
+
+# Задача импорта не найдена
+ImportJobNotFoundException = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail='Задача импорта не найдена',
+)
@@ -1,19 +1,70 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from loguru import logger
 
+from app.api.admin_api import router as admin_router
 from app.api.auth_api import router as auth_router
+from app.api.internal_api import router as internal_router
+from app.api.jwks_api import router as jwks_router
+from app.api.metrics_api import router as metrics_router
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.database.database import engine, pool_stats, replica_set
+from app.services.import_service import import_tasks
+from app.services.revocation_service import sync_revocation_list
+from app.services.warmup_service import warm_up
+from app.utils import password_hasher
+
+
+async def log_pool_stats(interval: float) -> None:
+    """Периодически пишет в лог состояние пула соединений с БД."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Состояние пула соединений: {}", pool_stats(engine))
+
+
+async def refresh_revocation_list(interval: float) -> None:
+    """Периодически синхронизирует список отозванных токенов с БД; первая загрузка выполняется при прогреве."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sync_revocation_list()
+        except Exception as e:
+            logger.error("Ошибка синхронизации списка отозванных токенов: {}", e)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[dict, None]:
     """Управление жизненным циклом приложения."""
     logging.info("Инициализация приложения...")
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+    revocation_task = asyncio.create_task(refresh_revocation_list(settings.REVOCATION_REFRESH_SECONDS))
+    pool_stats_task = None
+    if settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS > 0:
+        pool_stats_task = asyncio.create_task(log_pool_stats(settings.DB_POOL_STATS_LOG_INTERVAL_SECONDS))
     yield
     logging.info("Завершение работы приложения...")
+    app.state.ready = False
+    # Незавершенные фоновые импорты отмечаются прерванными
+    for task in (warm_up_task, revocation_task, pool_stats_task, *import_tasks):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    password_hasher.shutdown()
+    for async_engine in (engine, *replica_set.engines):
+        await async_engine.dispose()
+    # Обработчики не удаляются: они установлены при создании приложения и нужны
+    # при повторном запуске lifespan в том же процессе
+    await logger.complete()
 
 
 def create_app() -> FastAPI:
@@ -23,9 +74,11 @@ def create_app() -> FastAPI:
     Returns:
         Сконфигурированное приложение FastAPI
     """
+    setup_logging()
     app = FastAPI(
         title="Catalog-API",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     app.add_middleware(
         CORSMiddleware,
@@ -33,6 +86,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     # Регистрация роутеров
     register_routers(app)
@@ -51,9 +106,21 @@ def register_routers(app: FastAPI) -> None:
             "message": "Добро пожаловать!",
         }
 
+    @root_router.get("/ready", tags=["root"])
+    def readiness(request: Request):
+        """Готовность принимать трафик: 503 до завершения прогрева."""
+        if not getattr(request.app.state, "ready", False):
+            return ORJSONResponse({"status": "warming_up"}, status_code=503)
+        return {"status": "ready"}
+
     # Подключение роутеров
     app.include_router(root_router, tags=["root"])
     app.include_router(auth_router, tags=["auth"])
+    app.include_router(admin_router, tags=["admin"])
+    app.include_router(internal_router, tags=["internal"])
+    app.include_router(jwks_router, tags=["auth"])
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
 
 
 # Создание экземпляра приложения
@@ -6,6 +6,8 @@ from sqlalchemy import pool
 from alembic import context
 
 from models.users import User
+from models.tokens import RevokedToken
+from models.import_jobs import ImportJob
 from database.base import Base
 from core.config import settings
 # this is the Alembic Config object, which provides
@@ -0,0 +1,27 @@
+"""Users role id index
+
+Revision ID: 8d1e6a0f2c37
+Revises: 5b2f3c8d9a41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1e6a0f2c37'
+down_revision: Union[str, None] = '5b2f3c8d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_role_id', 'users', ['role', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_role_id', table_name='users')
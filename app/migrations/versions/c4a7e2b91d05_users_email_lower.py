@@ -0,0 +1,33 @@
+"""Users email lower unique index
+
+Revision ID: c4a7e2b91d05
+Revises: 8d1e6a0f2c37
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2b91d05'
+down_revision: Union[str, None] = '8d1e6a0f2c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Миграция завершится ошибкой, если есть адреса, различающиеся только регистром:
+    # такие дубликаты нужно объединить вручную до применения
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_constraint(op.f('uq_users_email'), 'users', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint(op.f('uq_users_email'), 'users', ['email'])
+    op.drop_index('ix_users_email_lower', table_name='users')
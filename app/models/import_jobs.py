@@ -0,0 +1,29 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import String, DateTime, JSON, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class ImportJobStatus(str, Enum):
+    """
+    Состояния задачи массового импорта.
+    """
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class ImportJob(Base):
+    """Задача массового импорта пользователей, запущенная через API."""
+    __tablename__ = "import_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), default=ImportJobStatus.running.value)
+    # Отчет SImportReport; заполняется по завершении импорта
+    report: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
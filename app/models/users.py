@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import String, Enum as SQLEnum
+from sqlalchemy import String, Enum as SQLEnum, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base
@@ -20,6 +20,14 @@ class User(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     first_name: Mapped[str] = mapped_column(String(50))
     last_name: Mapped[str] = mapped_column(String(50))
-    email: Mapped[str] = mapped_column(String(100), unique=True)
+    # Уникальность без учета регистра обеспечивает индекс ix_users_email_lower
+    email: Mapped[str] = mapped_column(String(100))
     password: Mapped[str] = mapped_column(String(255))
     role: Mapped[RoleEnum] = mapped_column(SQLEnum(RoleEnum), default=RoleEnum.patient)
+
+    # Постраничный список пользователей с фильтром по роли читается по этому индексу
+    __table_args__ = (Index("ix_users_role_id", "role", "id"),)
+
+
+# Поиск по email выполняется по lower(email), поэтому уникальный индекс функциональный
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
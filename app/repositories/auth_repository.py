@@ -1,6 +1,63 @@
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cache import principal_cache
 from app.models.users import User
 from app.repositories.base_repository import BaseRepository
+from app.schemas.users_schema import SUserPrincipal
+
+# Колонки, загружаемые при массовом импорте, в порядке значений в кортежах
+IMPORT_COLUMNS = ("first_name", "last_name", "email", "password", "role")
 
 
 class UsersRepository(BaseRepository):
     model = User
+    case_insensitive_keys = frozenset({"email"})
+
+    def _invalidate(self, filter_dict: dict) -> None:
+        """Сбрасывает снимки пользователей, затронутых изменением, из кеша."""
+        if not filter_dict or not filter_dict.keys() <= SUserPrincipal.model_fields.keys():
+            # Фильтр по полям, которых нет в снимке: затронутых пользователей не определить
+            principal_cache.clear()
+            return
+        principal_cache.discard_where(
+            lambda principal: all(getattr(principal, key) == value for key, value in filter_dict.items())
+        )
+
+    async def bulk_insert_if_absent(self, rows: list[tuple]) -> list[str]:
+        """
+        Массово добавляет пользователей, пропуская уже существующие email.
+
+        Строки загружаются через COPY во временную таблицу, а затем переносятся в users
+        одним INSERT ... ON CONFLICT DO NOTHING. Работает только с PostgreSQL (asyncpg)
+        и должен вызываться внутри транзакции: временная таблица очищается при коммите.
+
+        :param rows: Кортежи значений в порядке IMPORT_COLUMNS, пароль — в виде хеша.
+        :return: Email добавленных пользователей.
+        :raises SQLAlchemyError: Если возникает ошибка при добавлении записей.
+        """
+        logger.info("Массовое добавление записей {}. Количество: {}", self.model.__name__, len(rows))
+        try:
+            await self._session.execute(text(
+                "CREATE TEMP TABLE IF NOT EXISTS users_import "
+                "(first_name text, last_name text, email text, password text, role text) "
+                "ON COMMIT DELETE ROWS"
+            ))
+            connection = await self._session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                "users_import", records=rows, columns=IMPORT_COLUMNS
+            )
+            result = await self._session.execute(text(
+                "INSERT INTO users (first_name, last_name, email, password, role) "
+                "SELECT DISTINCT ON (lower(email)) first_name, last_name, lower(email), password, role::roleenum "
+                "FROM users_import ORDER BY lower(email) "
+                "ON CONFLICT DO NOTHING RETURNING email"
+            ))
+            inserted = list(result.scalars())
+            logger.info("Успешно добавлено {} записей из {}.", len(inserted), len(rows))
+            return inserted
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при массовом добавлении записей: {}", e)
+            raise
@@ -1,18 +1,52 @@
 from abc import abstractmethod, ABC
-from typing import List, TypeVar, Type
+from functools import lru_cache
+from typing import AsyncIterator, List, Sequence, TypeVar, Type
 
 from pydantic import BaseModel
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, insert
+from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete, insert, bindparam, exists, func
+from sqlalchemy.dialects import postgresql, sqlite
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.base import Base
+from app.database.database import on_commit
 
 T = TypeVar("T", bound=Base)
 
 
+@lru_cache(maxsize=256)
+def lookup_statement(
+        model: type,
+        key: str,
+        columns: tuple[str, ...] | None = None,
+        check_exists: bool = False,
+        case_insensitive: bool = False,
+):
+    """
+    Возвращает заранее построенный запрос поиска по одному столбцу.
+
+    Запрос строится один раз для каждого сочетания параметров, значение передается
+    через bindparam("value"). Повторное использование одного объекта запроса избавляет
+    от построения SELECT и вычисления ключа кеша компиляции SQLAlchemy при каждом вызове
+    (ключ запоминается в объекте), а неизменный текст SQL попадает в кеш подготовленных
+    выражений asyncpg.
+
+    :param model: Модель SQLAlchemy.
+    :param key: Столбец, по которому выполняется поиск.
+    :param columns: Столбцы для выборки (None — вся сущность).
+    :param check_exists: Построить запрос проверки существования.
+    :param case_insensitive: Сравнивать lower(key) со значением (значение передается в нижнем регистре).
+    """
+    column = getattr(model, key)
+    condition = (func.lower(column) if case_insensitive else column) == bindparam("value")
+    if check_exists:
+        return select(exists().where(condition))
+    entities = (model,) if columns is None else tuple(getattr(model, column) for column in columns)
+    return select(*entities).where(condition)
+
+
 class AbstractRepository(ABC):
 
     @abstractmethod
@@ -43,65 +77,225 @@ class SqlAlchemyRepository(AbstractRepository):
 
 class BaseRepository(SqlAlchemyRepository):
     model: Type[T] = None
+    # Столбцы, сравниваемые без учета регистра через lower(столбец); для них нужен функциональный индекс
+    case_insensitive_keys: frozenset[str] = frozenset()
+
+    def _conditions(self, filter_dict: dict) -> list:
+        """Условия WHERE для фильтров с учетом case_insensitive_keys."""
+        conditions = []
+        for key, value in filter_dict.items():
+            column = getattr(self.model, key)
+            if key in self.case_insensitive_keys and isinstance(value, str):
+                conditions.append(func.lower(column) == value.lower())
+            else:
+                conditions.append(column == value)
+        return conditions
 
-    async def find_one_or_none_by_id(self, data_id: int):
+    def _invalidate(self, filter_dict: dict) -> None:
         """
-        Ищет запись в базе данных по заданному идентификатору.
+        Вызывается после коммита транзакции, в которой записи были изменены или удалены.
 
-        :param data_id: Идентификатор записи для поиска.
-        :return: Найденная запись или None, если запись не найдена.
+        Сброс до коммита позволил бы конкурентному запросу прочитать еще не измененную
+        строку и снова закешировать ее. Дочерние репозитории переопределяют метод,
+        чтобы сбросить закешированные данные.
+
+        :param filter_dict: Фильтры, по которым были изменены записи.
+        """
+
+    def _select(self, columns: Sequence[str] | None = None):
+        """
+        Формирует SELECT по модели или только по указанным столбцам.
+
+        При проекции результат состоит из легковесных строк Row с доступом к полям
+        по атрибутам: они не попадают в identity map сессии и не отслеживаются ORM.
+
+        :param columns: Имена столбцов модели (None — вся сущность).
+        """
+        if columns is None:
+            return select(self.model)
+        return select(*(getattr(self.model, column) for column in columns))
+
+    @staticmethod
+    def _one_or_none(result, columns: Sequence[str] | None):
+        return result.scalar_one_or_none() if columns is None else result.one_or_none()
+
+    async def find_one_by(self, key: str, value, columns: tuple[str, ...] | None = None):
+        """
+        Ищет одну запись по значению уникального столбца заранее построенным запросом.
+
+        Предназначен для частых поисков (по id, по email) вместо find_one_or_none,
+        который строит запрос заново из Pydantic-модели фильтров при каждом вызове.
+
+        :param key: Уникальный столбец.
+        :param value: Значение столбца.
+        :param columns: Столбцы для выборки (None — вся сущность).
+        :return: Найденная запись (строка Row при проекции) или None, если запись не найдена.
         :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
         """
+        case_insensitive = key in self.case_insensitive_keys
+        if case_insensitive:
+            value = value.lower()
         try:
-            query = select(self.model).filter_by(id=data_id)
-            result = await self._session.execute(query)
-            record = result.scalar_one_or_none()
-            log_message = f"Запись {self.model.__name__} с ID {data_id} {'найдена' if record else 'не найдена'}."
-            logger.info(log_message)
+            statement = lookup_statement(self.model, key, columns, case_insensitive=case_insensitive)
+            result = await self._session.execute(statement, {"value": value})
+            record = self._one_or_none(result, columns)
+            logger.debug("Запись {} с {}={} {}.", self.model.__name__, key, value, 'найдена' if record else 'не найдена')
             return record
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при поиске записи с ID {data_id}: {e}")
+            logger.error("Ошибка при поиске записи с {}={}: {}", key, value, e)
+            raise
+
+    async def exists_by(self, key: str, value) -> bool:
+        """
+        Проверяет существование записи со значением столбца без загрузки самой записи.
+
+        :param key: Столбец.
+        :param value: Значение столбца.
+        :return: True, если запись существует.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        case_insensitive = key in self.case_insensitive_keys
+        if case_insensitive:
+            value = value.lower()
+        try:
+            result = await self._session.execute(
+                lookup_statement(self.model, key, check_exists=True, case_insensitive=case_insensitive),
+                {"value": value},
+            )
+            return result.scalar()
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при проверке существования записи с {}={}: {}", key, value, e)
             raise
 
-    async def find_one_or_none(self, filters: BaseModel):
+    async def find_one_or_none_by_id(self, data_id: int, columns: tuple[str, ...] | None = None):
+        """
+        Ищет запись в базе данных по заданному идентификатору.
+
+        :param data_id: Идентификатор записи для поиска.
+        :param columns: Столбцы для выборки (None — вся сущность).
+        :return: Найденная запись (строка Row при проекции) или None, если запись не найдена.
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        return await self.find_one_by("id", data_id, columns)
+
+    async def find_one_or_none(self, filters: BaseModel, columns: Sequence[str] | None = None):
         """
         Ищет одну запись в базе данных по заданным фильтрам.
 
         :param filters: Фильтры для поиска записи.
-        :return: Найденная запись или None, если запись не найдена.
+        :param columns: Столбцы для выборки (None — вся сущность).
+        :return: Найденная запись (строка Row при проекции) или None, если запись не найдена.
         :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
         """
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(f"Поиск одной записи {self.model.__name__} по фильтрам: {filter_dict}")
+        logger.debug("Поиск одной записи {} по фильтрам: {}", self.model.__name__, filter_dict)
         try:
-            query = select(self.model).filter_by(**filter_dict)
+            query = self._select(columns).where(*self._conditions(filter_dict))
             result = await self._session.execute(query)
-            record = result.scalar_one_or_none()
-            log_message = f"Запись {'найдена' if record else 'не найдена'} по фильтрам: {filter_dict}"
-            logger.info(log_message)
+            record = self._one_or_none(result, columns)
+            logger.debug("Запись {} по фильтрам: {}", 'найдена' if record else 'не найдена', filter_dict)
             return record
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при поиске записи по фильтрам {filter_dict}: {e}")
+            logger.error("Ошибка при поиске записи по фильтрам {}: {}", filter_dict, e)
             raise
 
-    async def find_all(self, filters: BaseModel | None = None):
+    async def find_all(self, filters: BaseModel | None = None, columns: Sequence[str] | None = None):
         """
         Ищет все записи в базе данных, соответствующие заданным фильтрам.
 
         :param filters: Фильтры для поиска записей (по умолчанию None).
-        :return: Список найденных записей.
+        :param columns: Столбцы для выборки (None — вся сущность).
+        :return: Список найденных записей (строк Row при проекции).
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        logger.debug("Поиск всех записей {} по фильтрам: {}", self.model.__name__, filter_dict)
+        try:
+            query = self._select(columns).where(*self._conditions(filter_dict))
+            result = await self._session.execute(query)
+            records = result.scalars().all() if columns is None else result.all()
+            logger.debug("Найдено {} записей.", len(records))
+            return records
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при поиске всех записей по фильтрам {}: {}", filter_dict, e)
+            raise
+
+    async def find_page(
+            self,
+            filters: BaseModel | None = None,
+            after=None,
+            limit: int = 100,
+            key: str = "id",
+            columns: Sequence[str] | None = None,
+    ):
+        """
+        Ищет страницу записей с пагинацией по ключу (keyset pagination).
+
+        Записи упорядочены по столбцу key; следующая страница запрашивается со значением
+        key последней записи в after. В отличие от OFFSET, стоимость запроса не растет
+        с номером страницы.
+
+        :param filters: Фильтры для поиска записей (по умолчанию None).
+        :param after: Значение key последней записи предыдущей страницы (None — первая страница).
+        :param limit: Максимальное количество записей на странице.
+        :param key: Уникальный столбец с индексом, по которому упорядочиваются записи.
+        :param columns: Столбцы для выборки (None — вся сущность); должны включать key.
+        :return: Список найденных записей (строк Row при проекции).
         :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
         """
         filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
-        logger.info(f"Поиск всех записей {self.model.__name__} по фильтрам: {filter_dict}")
+        logger.debug("Поиск страницы записей {} после {} по фильтрам: {}", self.model.__name__, after, filter_dict)
+        column = getattr(self.model, key)
         try:
-            query = select(self.model).filter_by(**filter_dict)
+            query = self._select(columns).where(*self._conditions(filter_dict)).order_by(column).limit(limit)
+            if after is not None:
+                query = query.where(column > after)
             result = await self._session.execute(query)
-            records = result.scalars().all()
-            logger.info(f"Найдено {len(records)} записей.")
+            records = result.scalars().all() if columns is None else result.all()
+            logger.debug("Найдено {} записей.", len(records))
             return records
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при поиске всех записей по фильтрам {filter_dict}: {e}")
+            logger.error("Ошибка при поиске страницы записей по фильтрам {}: {}", filter_dict, e)
+            raise
+
+    async def stream_all(
+            self,
+            filters: BaseModel | None = None,
+            chunk_size: int = 1000,
+            key: str = "id",
+            columns: Sequence[str] | None = None,
+    ) -> AsyncIterator[list]:
+        """
+        Потоково читает все записи, соответствующие фильтрам, порциями по chunk_size.
+
+        Используется серверный курсор, поэтому в памяти одновременно находится не более
+        одной порции: identity map сессии хранит слабые ссылки, и записи обработанных
+        порций освобождаются. Для PostgreSQL сессия должна быть в транзакции (не AUTOCOMMIT).
+
+        :param filters: Фильтры для поиска записей (по умолчанию None).
+        :param chunk_size: Количество записей в порции.
+        :param key: Столбец, по которому упорядочиваются записи.
+        :param columns: Столбцы для выборки (None — вся сущность).
+        :return: Асинхронный итератор порций записей (строк Row при проекции).
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        filter_dict = filters.model_dump(exclude_unset=True) if filters else {}
+        logger.debug("Потоковое чтение записей {} по фильтрам: {}", self.model.__name__, filter_dict)
+        try:
+            query = (
+                self._select(columns)
+                .where(*self._conditions(filter_dict))
+                .order_by(getattr(self.model, key))
+                .execution_options(yield_per=chunk_size)
+            )
+            if columns is None:
+                result = await self._session.stream_scalars(query)
+            else:
+                result = await self._session.stream(query)
+            async for partition in result.partitions():
+                yield partition
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при потоковом чтении записей по фильтрам {}: {}", filter_dict, e)
             raise
 
     async def add(self, values: BaseModel):
@@ -113,15 +307,39 @@ class BaseRepository(SqlAlchemyRepository):
         :raises SQLAlchemyError: Если возникает ошибка при добавлении записи.
         """
         values_dict = values.model_dump(exclude_unset=True)
-        logger.info(f"Добавление записи {self.model.__name__} с параметрами: {values_dict}")
+        logger.info("Добавление записи {} с параметрами: {}", self.model.__name__, values_dict)
         try:
             new_instance = self.model(**values_dict)
             self._session.add(new_instance)
-            logger.info(f"Запись {self.model.__name__} успешно добавлена.")
+            logger.info("Запись {} успешно добавлена.", self.model.__name__)
             await self._session.flush()
             return new_instance
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при добавлении записи: {e}")
+            logger.error("Ошибка при добавлении записи: {}", e)
+            raise
+
+    async def add_if_absent(self, values: BaseModel):
+        """
+        Добавляет новую запись, если она не нарушает ограничений уникальности.
+
+        Выполняется одним запросом INSERT ... ON CONFLICT DO NOTHING RETURNING,
+        поэтому конкурентные вставки не приводят к ошибке уникальности.
+
+        :param values: Данные для добавления, представленные в виде Pydantic-модели.
+        :return: Добавленная запись или None, если такая запись уже существует.
+        :raises SQLAlchemyError: Если возникает ошибка при добавлении записи.
+        """
+        values_dict = values.model_dump(exclude_unset=True)
+        logger.info("Добавление записи {}, если она отсутствует, с параметрами: {}", self.model.__name__, values_dict)
+        dialect_insert = sqlite.insert if self._session.get_bind().dialect.name == "sqlite" else postgresql.insert
+        try:
+            query = dialect_insert(self.model).values(**values_dict).on_conflict_do_nothing().returning(self.model)
+            result = await self._session.execute(query)
+            record = result.scalar_one_or_none()
+            logger.info("Запись {} {}.", self.model.__name__, 'добавлена' if record else 'уже существует')
+            return record
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при добавлении записи: {}", e)
             raise
 
     async def add_many(self, instances: List[BaseModel]):
@@ -133,15 +351,15 @@ class BaseRepository(SqlAlchemyRepository):
         :raises SQLAlchemyError: Если возникает ошибка при добавлении записей.
         """
         values_list = [item.model_dump(exclude_unset=True) for item in instances]
-        logger.info(f"Добавление нескольких записей {self.model.__name__}. Количество: {len(values_list)}")
+        logger.info("Добавление нескольких записей {}. Количество: {}", self.model.__name__, len(values_list))
         try:
             new_instances = [self.model(**values) for values in values_list]
             self._session.add_all(new_instances)
-            logger.info(f"Успешно добавлено {len(new_instances)} записей.")
+            logger.info("Успешно добавлено {} записей.", len(new_instances))
             await self._session.flush()
             return new_instances
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при добавлении нескольких записей: {e}")
+            logger.error("Ошибка при добавлении нескольких записей: {}", e)
             raise
 
     async def update(self, filters: BaseModel, values: BaseModel):
@@ -156,20 +374,21 @@ class BaseRepository(SqlAlchemyRepository):
         filter_dict = filters.model_dump(exclude_unset=True)
         values_dict = values.model_dump(exclude_unset=True)
         logger.info(
-            f"Обновление записей {self.model.__name__} по фильтру: {filter_dict} с параметрами: {values_dict}")
+            "Обновление записей {} по фильтру: {} с параметрами: {}", self.model.__name__, filter_dict, values_dict)
         try:
             query = (
                 sqlalchemy_update(self.model)
-                .where(*[getattr(self.model, k) == v for k, v in filter_dict.items()])
+                .where(*self._conditions(filter_dict))
                 .values(**values_dict)
                 .execution_options(synchronize_session="fetch")
             )
             result = await self._session.execute(query)
-            logger.info(f"Обновлено {result.rowcount} записей.")
+            logger.info("Обновлено {} записей.", result.rowcount)
             await self._session.flush()
+            on_commit(self._session, lambda: self._invalidate(filter_dict))
             return result.rowcount
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при обновлении записей: {e}")
+            logger.error("Ошибка при обновлении записей: {}", e)
             raise
 
     async def delete(self, filters: BaseModel):
@@ -182,16 +401,17 @@ class BaseRepository(SqlAlchemyRepository):
         :raises SQLAlchemyError: Если возникает ошибка при удалении записей.
         """
         filter_dict = filters.model_dump(exclude_unset=True)
-        logger.info(f"Удаление записей {self.model.__name__} по фильтру: {filter_dict}")
+        logger.info("Удаление записей {} по фильтру: {}", self.model.__name__, filter_dict)
         if not filter_dict:
             logger.error("Нужен хотя бы один фильтр для удаления.")
             raise ValueError("Нужен хотя бы один фильтр для удаления.")
         try:
-            query = sqlalchemy_delete(self.model).filter_by(**filter_dict)
+            query = sqlalchemy_delete(self.model).where(*self._conditions(filter_dict))
             result = await self._session.execute(query)
-            logger.info(f"Удалено {result.rowcount} записей.")
+            logger.info("Удалено {} записей.", result.rowcount)
             await self._session.flush()
+            on_commit(self._session, lambda: self._invalidate(filter_dict))
             return result.rowcount
         except SQLAlchemyError as e:
-            logger.error(f"Ошибка при удалении записей: {e}")
+            logger.error("Ошибка при удалении записей: {}", e)
             raise
@@ -0,0 +1,6 @@
+from app.models.import_jobs import ImportJob
+from app.repositories.base_repository import BaseRepository
+
+
+class ImportJobsRepository(BaseRepository):
+    model = ImportJob
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import delete as sqlalchemy_delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.future import select
+
+from app.models.tokens import RevokedToken
+from app.repositories.base_repository import BaseRepository
+
+
+class RevokedTokensRepository(BaseRepository):
+    model = RevokedToken
+
+    async def find_active(self, now: datetime) -> list[tuple[str, datetime]]:
+        """
+        Возвращает отозванные токены, срок действия которых еще не истек.
+
+        :param now: Текущий момент времени.
+        :return: Пары (jti, expires_at).
+        :raises SQLAlchemyError: Если возникает ошибка при выполнении запроса.
+        """
+        try:
+            query = select(self.model.jti, self.model.expires_at).where(self.model.expires_at > now)
+            result = await self._session.execute(query)
+            return [tuple(row) for row in result]
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при загрузке отозванных токенов: {}", e)
+            raise
+
+    async def delete_expired(self, now: datetime) -> int:
+        """
+        Удаляет записи об отозванных токенах, срок действия которых истек.
+
+        :param now: Текущий момент времени.
+        :return: Количество удаленных записей.
+        :raises SQLAlchemyError: Если возникает ошибка при удалении записей.
+        """
+        try:
+            query = sqlalchemy_delete(self.model).where(self.model.expires_at <= now)
+            result = await self._session.execute(query)
+            logger.debug("Удалено {} истекших отозванных токенов.", result.rowcount)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error("Ошибка при удалении истекших отозванных токенов: {}", e)
+            raise
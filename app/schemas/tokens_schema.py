@@ -0,0 +1,8 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SRevokedToken(BaseModel):
+    jti: str
+    expires_at: datetime
@@ -1,13 +1,21 @@
+from datetime import datetime
 from typing import Self, Optional
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
 
-from app.utils import get_password_hash
+from app.models.import_jobs import ImportJobStatus
+from app.models.users import RoleEnum
 
 
 class SEmailModel(BaseModel):
     email: EmailStr = Field(description="Электронная почта")
     model_config = ConfigDict(from_attributes=True)
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        """Адреса, различающиеся только регистром, считаются одним адресом."""
+        return email.lower()
+
 
 class SUserBase(SEmailModel):
     first_name: str = Field(min_length=3, max_length=50, description="Имя, от 3 до 50 символов")
@@ -23,7 +31,7 @@ class SUserRegister(SUserBase):
     def check_password(self) -> Self:
         if self.password != self.confirm_password:
             raise ValueError("Пароли не совпадают")
-        self.password = get_password_hash(self.password)  # хешируем пароль до сохранения в базе данных
+        # пароль хешируется в UserService.create_user, вне event loop
         return self
 
 
@@ -44,7 +52,95 @@ class UserUpdate(BaseModel):
     last_name: Optional[str] = None
     email: Optional[EmailStr] = None
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str | None) -> str | None:
+        return email.lower() if email is not None else None
+
+
+class SUserPasswordUpdate(BaseModel):
+    password: str = Field(description="Пароль в формате HASH-строки")
+
+
+class SUserPrincipal(SEmailModel):
+    """Компактный снимок аутентифицированного пользователя без пароля."""
+    id: int = Field(description="Идентификатор пользователя")
+    first_name: str
+    last_name: str
+    role: RoleEnum
+
+
+# Столбцы, достаточные для построения SUserPrincipal, без хеша пароля
+PRINCIPAL_COLUMNS = tuple(SUserPrincipal.model_fields)
+# Столбцы для входа: профиль и хеш пароля
+LOGIN_COLUMNS = (*PRINCIPAL_COLUMNS, "password")
+
+
+class SUserFilter(BaseModel):
+    role: RoleEnum = Field(description="Роль пользователя")
+
+
+class SUserPage(BaseModel):
+    """Страница списка пользователей."""
+    items: list[SUserPrincipal]
+    next_cursor: int | None = Field(default=None, description="Курсор следующей страницы; None — страниц больше нет")
+
+
+class SUserImport(SUserBase):
+    """Строка файла массового импорта пользователей."""
+    role: RoleEnum = RoleEnum.patient
+    password: str = Field(min_length=5, max_length=50, description="Пароль, от 5 до 50 знаков")
+
+
+class SImportError(BaseModel):
+    line: int = Field(description="Номер строки в файле")
+    error: str
+
+
+class SImportReport(BaseModel):
+    """Итоги массового импорта пользователей."""
+    total: int = Field(default=0, description="Обработано строк")
+    inserted: int = Field(default=0, description="Добавлено пользователей")
+    conflicts: int = Field(default=0, description="Пропущено из-за существующего email")
+    invalid: int = Field(default=0, description="Строк, не прошедших валидацию")
+    conflict_samples: list[str] = Field(default_factory=list, description="Примеры конфликтующих email")
+    error_samples: list[SImportError] = Field(default_factory=list, description="Примеры ошибок валидации")
+    elapsed_seconds: float = 0
+    rows_per_second: float = 0
+
+
+class SImportJob(BaseModel):
+    """Задача массового импорта пользователей."""
+    id: str = Field(description="Идентификатор задачи")
+    status: ImportJobStatus
+    report: SImportReport | None = Field(default=None, description="Отчет; заполняется по завершении импорта")
+    error: str | None = Field(default=None, description="Причина ошибки импорта")
+    created_at: datetime
+    finished_at: datetime | None = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SImportJobId(BaseModel):
+    id: str
+
+
+class SImportJobAdd(SImportJobId):
+    created_at: datetime
+
+
+class SImportJobResult(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    status: ImportJobStatus
+    report: dict | None = None
+    error: str | None = None
+    finished_at: datetime
+
 
 class SToken(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class SRefreshToken(BaseModel):
+    refresh_token: str
@@ -0,0 +1,95 @@
+import importlib.util
+import os
+import signal
+import time
+from types import FrameType
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+
+
+def available_cpus() -> int:
+    """Количество CPU, доступных процессу (с учетом ограничения affinity в контейнере)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    Сервер с плавной остановкой.
+
+    По первому SIGTERM/SIGINT приложение сразу отмечается неготовым (/ready отвечает 503),
+    но продолжает принимать запросы drain_delay секунд, пока балансировщик исключает
+    экземпляр. Затем uvicorn перестает принимать соединения и ждет завершения текущих
+    запросов. Повторный сигнал останавливает сервер без задержки.
+    """
+
+    def __init__(self, config: uvicorn.Config, drain_delay: float = 0):
+        super().__init__(config)
+        self.drain_delay = drain_delay
+        self._drain_deadline: float | None = None
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if self._drain_deadline is None and self.drain_delay > 0:
+            from app.main import app
+            app.state.ready = False
+            self._drain_deadline = time.monotonic() + self.drain_delay
+            self._drain_signal = sig
+            logger.info("Получен сигнал {}, остановка через {} с", signal.Signals(sig).name, self.drain_delay)
+            return
+        super().handle_exit(sig, frame)
+
+    async def shutdown(self, sockets=None) -> None:
+        await super().shutdown(sockets=sockets)
+        # Процесс сервера завершается: закрываем очереди обработчиков loguru с enqueue=True
+        await logger.complete()
+        logger.remove()
+
+    async def on_tick(self, counter: int) -> bool:
+        if self._drain_deadline is not None and not self.should_exit and time.monotonic() >= self._drain_deadline:
+            super().handle_exit(self._drain_signal, None)
+        return await super().on_tick(counter)
+
+
+def build_config(host: str, port: int, workers: int) -> uvicorn.Config:
+    """Конфигурация uvicorn: uvloop и httptools используются, если установлены."""
+    return uvicorn.Config(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        server_header=False,
+    )
+
+
+def run(host: str, port: int, workers: int) -> None:
+    """
+    Запускает сервер; при workers > 1 — под управлением супервизора uvicorn,
+    который перезапускает упавшие процессы и передает им сигналы остановки.
+    """
+    if workers > 1 and settings.PASSWORD_HASH_WORKERS is None:
+        # Пул хеширования создается в каждом процессе сервера: делим CPU между ними,
+        # чтобы общее число процессов хеширования не превышало число CPU
+        os.environ["PASSWORD_HASH_WORKERS"] = str(max(1, available_cpus() // workers))
+
+    config = build_config(host, port, workers)
+    server = DrainingServer(config, drain_delay=settings.SERVER_DRAIN_DELAY_SECONDS)
+    logger.info(
+        "Запуск сервера {}:{}: процессов {}, loop={}, http={}",
+        host, port, workers, config.loop, config.http,
+    )
+    if workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
@@ -0,0 +1,54 @@
+from typing import AsyncIterator
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.database.database import async_session_maker
+from app.models.users import RoleEnum
+from app.repositories.auth_repository import UsersRepository
+from app.schemas.users_schema import SUserFilter, SUserPrincipal, PRINCIPAL_COLUMNS
+
+
+class UserExportService:
+    """
+    Потоковая выгрузка пользователей в JSONL.
+
+    Пользователи читаются серверным курсором порциями по chunk_size строк, и каждая
+    порция сразу отдается клиенту, поэтому потребление памяти не зависит от размера таблицы.
+    """
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+            chunk_size: int = settings.EXPORT_CHUNK_SIZE,
+    ):
+        """
+        :param session_maker: Фабрика сессий; сессия открывается на время выгрузки.
+        :param chunk_size: Количество строк, читаемых из курсора за раз.
+        """
+        self.session_maker = session_maker
+        self.chunk_size = chunk_size
+
+    async def export_jsonl(self, role: RoleEnum | None = None) -> AsyncIterator[bytes]:
+        """
+        Выгружает пользователей в формате JSONL.
+
+        Сессия открывается внутри генератора: StreamingResponse читает его уже после
+        завершения зависимостей эндпоинта.
+
+        :param role: Роль для фильтрации (None — все пользователи).
+        :return: Асинхронный итератор порций JSONL.
+        """
+        total = 0
+        async with self.session_maker() as session:
+            users_repo = UsersRepository(session)
+            filters = SUserFilter(role=role) if role else None
+            async for users in users_repo.stream_all(
+                    filters=filters, chunk_size=self.chunk_size, columns=PRINCIPAL_COLUMNS
+            ):
+                total += len(users)
+                yield "".join(
+                    SUserPrincipal.model_validate(user).model_dump_json() + "\n" for user in users
+                ).encode()
+        logger.info("Выгружено пользователей: {}", total)
@@ -0,0 +1,241 @@
+import asyncio
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import suppress
+from datetime import datetime, timezone
+from itertools import islice
+from typing import BinaryIO, Iterator, Literal, TextIO
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.database.database import async_session_maker
+from app.models.import_jobs import ImportJobStatus
+from app.repositories.auth_repository import UsersRepository
+from app.repositories.import_jobs_repository import ImportJobsRepository
+from app.schemas.users_schema import (
+    SUserImport, SImportError, SImportReport, SImportJob, SImportJobAdd, SImportJobId, SImportJobResult,
+)
+from app.utils import password_hasher
+
+ImportFormat = Literal["jsonl", "csv"]
+
+
+def detect_format(filename: str) -> ImportFormat:
+    """
+    Определяет формат файла импорта по расширению.
+
+    :param filename: Имя файла.
+    :return: "csv" для *.csv, иначе "jsonl".
+    """
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+def iter_records(stream: TextIO, fmt: ImportFormat) -> Iterator[tuple[int, dict | None]]:
+    """
+    Построчно читает файл импорта, не загружая его в память целиком.
+
+    :param stream: Текстовый поток с данными.
+    :param fmt: Формат файла: "jsonl" или "csv" (с заголовком).
+    :return: Итератор пар (номер строки, данные); данные равны None, если строку не удалось разобрать.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield line_no, data if isinstance(data, dict) else None
+
+
+class UserImportService:
+    """
+    Массовый импорт пользователей из JSONL/CSV.
+
+    Файл обрабатывается порциями по chunk_size строк: порция валидируется, пароли
+    хешируются в пуле процессов, а записи загружаются через COPY в отдельной
+    транзакции. Потребление памяти зависит только от размера порции.
+    """
+
+    # Максимальное количество примеров конфликтов и ошибок в отчете
+    SAMPLE_LIMIT = 100
+
+    def __init__(
+            self,
+            session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+            chunk_size: int = settings.IMPORT_CHUNK_SIZE,
+    ):
+        """
+        :param session_maker: Фабрика сессий; каждая порция загружается в своей транзакции.
+        :param chunk_size: Количество строк в порции.
+        """
+        self.session_maker = session_maker
+        self.chunk_size = chunk_size
+
+    async def import_stream(self, stream: TextIO, fmt: ImportFormat) -> SImportReport:
+        """
+        Импортирует пользователей из текстового потока.
+
+        :param stream: Поток с данными в формате fmt.
+        :param fmt: Формат данных: "jsonl" или "csv".
+        :return: Отчет об импорте.
+        """
+        report = SImportReport()
+        started = time.perf_counter()
+        records = iter_records(stream, fmt)
+        while True:
+            # Чтение файла блокирующее, поэтому выполняется вне event loop
+            chunk = await asyncio.to_thread(lambda: list(islice(records, self.chunk_size)))
+            if not chunk:
+                break
+            await self._import_chunk(chunk, report)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Импорт: обработано {} строк, добавлено {}, конфликтов {}, ошибок {}, {:.0f} строк/с",
+                report.total, report.inserted, report.conflicts, report.invalid, report.total / elapsed,
+            )
+
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        report.rows_per_second = round(report.total / report.elapsed_seconds, 1) if report.elapsed_seconds else 0
+        return report
+
+    async def _import_chunk(self, chunk: list[tuple[int, dict | None]], report: SImportReport) -> None:
+        users: list[SUserImport] = []
+        for line_no, data in chunk:
+            report.total += 1
+            if data is None:
+                self._add_error(report, line_no, "Некорректный формат строки")
+                continue
+            try:
+                users.append(SUserImport.model_validate(data))
+            except ValidationError as e:
+                self._add_error(report, line_no, "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+                ))
+        if not users:
+            return
+
+        hashes = await password_hasher.hash_many([user.password for user in users])
+        rows = [
+            (user.first_name, user.last_name, user.email, hashed, user.role.value)
+            for user, hashed in zip(users, hashes)
+        ]
+        async with self.session_maker() as session:
+            async with session.begin():
+                inserted = set(await UsersRepository(session).bulk_insert_if_absent(rows))
+
+        report.inserted += len(inserted)
+        report.conflicts += len(rows) - len(inserted)
+        # Конфликт — email, уже существовавший в БД, или повтор email внутри порции
+        seen: set[str] = set()
+        for user in users:
+            if len(report.conflict_samples) >= self.SAMPLE_LIMIT:
+                break
+            if user.email not in inserted or user.email in seen:
+                report.conflict_samples.append(user.email)
+            seen.add(user.email)
+
+    def _add_error(self, report: SImportReport, line_no: int, error: str) -> None:
+        report.invalid += 1
+        if len(report.error_samples) < self.SAMPLE_LIMIT:
+            report.error_samples.append(SImportError(line=line_no, error=error))
+
+
+def save_upload(source: BinaryIO) -> str:
+    """
+    Копирует загруженный файл во временный файл, который переживет запрос.
+
+    :param source: Бинарный поток загруженного файла.
+    :return: Путь к временному файлу.
+    """
+    with tempfile.NamedTemporaryFile("wb", prefix="users_import_", delete=False) as target:
+        shutil.copyfileobj(source, target)
+    return target.name
+
+
+# Выполняющиеся фоновые импорты; ссылки удерживаются, чтобы задачи не собрал сборщик мусора
+import_tasks: set[asyncio.Task] = set()
+
+
+class ImportJobService:
+    """
+    Фоновый импорт пользователей, запущенный через API.
+
+    Импорт выполняется в процессе, принявшем файл, а состояние и отчет задачи хранятся
+    в таблице import_jobs, поэтому их может вернуть любой процесс сервиса.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        """
+        :param session_maker: Фабрика сессий для записи состояния задачи и импорта.
+        """
+        self.session_maker = session_maker
+
+    async def start(self, path: str, fmt: ImportFormat) -> SImportJob:
+        """
+        Регистрирует задачу и запускает импорт файла в фоне.
+
+        :param path: Путь к файлу с данными; файл удаляется по завершении импорта.
+        :param fmt: Формат данных: "jsonl" или "csv".
+        :return: Созданная задача в состоянии running.
+        """
+        values = SImportJobAdd(id=uuid.uuid4().hex, created_at=datetime.now(timezone.utc))
+        async with self.session_maker() as session:
+            async with session.begin():
+                job = SImportJob.model_validate(await ImportJobsRepository(session).add(values))
+        task = asyncio.create_task(self._run(job.id, path, fmt))
+        import_tasks.add(task)
+        task.add_done_callback(import_tasks.discard)
+        logger.info("Запущен импорт пользователей, задача {}", job.id)
+        return job
+
+    async def get(self, job_id: str) -> SImportJob | None:
+        """
+        Получение задачи импорта.
+
+        :param job_id: Идентификатор задачи.
+        :return: Задача или None, если она не найдена.
+        """
+        async with self.session_maker() as session:
+            job = await ImportJobsRepository(session).find_one_or_none_by_id(job_id)
+        return SImportJob.model_validate(job) if job else None
+
+    async def _run(self, job_id: str, path: str, fmt: ImportFormat) -> None:
+        try:
+            with open(path, encoding="utf-8", newline="") as stream:
+                report = await UserImportService(self.session_maker).import_stream(stream, fmt)
+        except asyncio.CancelledError:
+            await self._finish(job_id, ImportJobStatus.failed, error="Импорт прерван остановкой сервера")
+            raise
+        except Exception as e:
+            logger.error("Ошибка импорта пользователей, задача {}: {}", job_id, e)
+            await self._finish(job_id, ImportJobStatus.failed, error=str(e))
+        else:
+            await self._finish(job_id, ImportJobStatus.done, report=report.model_dump(mode="json"))
+        finally:
+            with suppress(OSError):
+                os.remove(path)
+
+    async def _finish(self, job_id: str, status: ImportJobStatus, **values) -> None:
+        result = SImportJobResult(status=status, finished_at=datetime.now(timezone.utc), **values)
+        try:
+            async with self.session_maker() as session:
+                async with session.begin():
+                    await ImportJobsRepository(session).update(filters=SImportJobId(id=job_id), values=result)
+        except Exception as e:
+            logger.error("Не удалось сохранить состояние задачи импорта {}: {}", job_id, e)
+        logger.info("Импорт пользователей завершен, задача {}: {}", job_id, status.value)
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.revocation import revocation_list
+from app.database.database import async_session_maker, on_commit
+from app.repositories.tokens_repository import RevokedTokensRepository
+from app.schemas.tokens_schema import SRevokedToken
+
+
+class RevocationService:
+    def __init__(self, session: AsyncSession):
+        """
+        Инициализация RevocationService.
+
+        :param session: Асинхронная сессия базы данных.
+        """
+        self.session = session
+        self.tokens_repo = RevokedTokensRepository(session)
+
+    async def revoke(self, jti: str, exp: float) -> bool:
+        """
+        Отзывает токен.
+
+        Запись добавляется одним запросом INSERT ... ON CONFLICT DO NOTHING, поэтому
+        из двух конкурентных отзывов одного токена успешен только один. Список отозванных
+        токенов процесса обновляется только после коммита транзакции сессии.
+
+        :param jti: Идентификатор токена.
+        :param exp: Время истечения токена (unix time).
+        :return: True, если токен отозван этим вызовом, False — если он уже был отозван.
+        """
+        expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
+        record = await self.tokens_repo.add_if_absent(values=SRevokedToken(jti=jti, expires_at=expires_at))
+        on_commit(self.session, lambda: revocation_list.add(jti, exp))
+        return record is not None
+
+    async def sync(self) -> int:
+        """
+        Удаляет истекшие записи и перестраивает список отозванных токенов в памяти по данным БД.
+
+        :return: Количество действующих отозванных токенов.
+        """
+        now = datetime.now(timezone.utc)
+        await self.tokens_repo.delete_expired(now)
+        active = await self.tokens_repo.find_active(now)
+        revocation_list.replace({jti: expires_at.timestamp() for jti, expires_at in active})
+        return len(active)
+
+
+async def sync_revocation_list(session_maker: async_sessionmaker = async_session_maker) -> None:
+    """Синхронизирует список отозванных токенов процесса с таблицей revoked_tokens."""
+    async with session_maker() as session:
+        count = await RevocationService(session).sync()
+        await session.commit()
+    logger.debug("Список отозванных токенов синхронизирован: {} записей", count)
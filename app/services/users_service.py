@@ -2,15 +2,22 @@ from datetime import timedelta
 
 from fastapi import HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
+from jwt.exceptions import InvalidTokenError
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.singleflight import user_lookups
+from app.core.security import create_access_token, create_refresh_token, decode_refresh_token, profile_claims
 from app.repositories.auth_repository import UsersRepository
-from app.schemas.users_schema import SUserRegister, SEmailModel, SUserAddDB, SToken
-from app.utils import verify_password
-from app.exceptions import UserAlreadyExistsException
+from app.models.users import RoleEnum
+from app.schemas.users_schema import (
+    SUserRegister, SUserAddDB, SToken, SUserPrincipal, SUserSearch, SUserPasswordUpdate,
+    SUserFilter, SUserPage, PRINCIPAL_COLUMNS, LOGIN_COLUMNS,
+)
+from app.utils import get_password_hash, verify_password, password_needs_update
+from app.services.revocation_service import RevocationService
+from app.exceptions import UserAlreadyExistsException, NoJwtException, TokenRevokedException
 
 
 class UserService:
@@ -30,36 +37,69 @@ class UserService:
         :return: Данные пользователя.
         :raises UserAlreadyExistsException: Если пользователь уже существует.
         """
-        existing_user = await self.users_repo.find_one_or_none(filters=SEmailModel(email=user_data.email))
-        if existing_user:
-            raise UserAlreadyExistsException
-
         # Подготовка данных для добавления
         user_data_dict = user_data.model_dump()
         user_data_dict.pop('confirm_password', None)
+        user_data_dict['password'] = await get_password_hash(user_data.password)
 
-        # Добавление пользователя
-        user = await self.users_repo.add(values=SUserAddDB(**user_data_dict))
+        # Добавление пользователя одним запросом; конфликт email означает, что пользователь уже есть
+        user = await self.users_repo.add_if_absent(values=SUserAddDB(**user_data_dict))
+        if user is None:
+            raise UserAlreadyExistsException
         return user
 
-    async def get_user_by_email(self, email: str):
+    async def get_user_by_email(self, email: str, columns: tuple[str, ...] | None = PRINCIPAL_COLUMNS):
         """
-        Получение пользователя по его идентификатору.
+        Получение пользователя по его почте.
+
+        По умолчанию читаются только столбцы профиля, без хеша пароля: результат —
+        легковесная строка, не отслеживаемая сессией.
+
+        В сессиях только для чтения одновременные поиски одного пользователя по столбцам
+        объединяются в один запрос к БД: пока он выполняется, остальные вызовы ждут и
+        получают его результат. Сессии с изменениями читают основную БД в своей транзакции,
+        а сущности (columns=None) привязаны к сессии, поэтому такие поиски не объединяются.
 
         :param email: почта пользователя.
+        :param columns: Столбцы для выборки (None — вся сущность).
         :return: Данные пользователя.
-        :raises UserNotFoundException: Если пользователь не найден.
         """
-        user = await self.users_repo.find_one_or_none(filters=SEmailModel(email=email))
+        if columns is None or not self.session.info.get("read_only"):
+            user = await self.users_repo.find_one_by("email", email, columns=columns)
+        else:
+            user = await user_lookups.do(
+                (email.lower(), columns),
+                lambda: self.users_repo.find_one_by("email", email, columns=columns),
+            )
         if not user:
-            logger.error(f"User not found for email: {email}")
+            logger.error("User not found for email: {}", email)
         return user
 
+    async def list_users(self, role: RoleEnum | None = None, after: int | None = None, limit: int = 100) -> SUserPage:
+        """
+        Получение страницы списка пользователей.
+
+        :param role: Роль для фильтрации (None — все пользователи).
+        :param after: Идентификатор последнего пользователя предыдущей страницы.
+        :param limit: Размер страницы.
+        :return: Страница пользователей и курсор следующей страницы.
+        """
+        filters = SUserFilter(role=role) if role else None
+        # Лишняя запись показывает, есть ли следующая страница
+        users = await self.users_repo.find_page(
+            filters=filters, after=after, limit=limit + 1, columns=PRINCIPAL_COLUMNS
+        )
+        items = [SUserPrincipal.model_validate(user) for user in users[:limit]]
+        next_cursor = items[-1].id if len(users) > limit else None
+        return SUserPage(items=items, next_cursor=next_cursor)
+
     async def login(self, form_data: OAuth2PasswordRequestForm = Depends(),):
         """Аутентификация пользователя и выдача JWT токена.
 
             Проверяет учетные данные пользователя (email/пароль) и генерирует JWT токен
-            при успешной аутентификации. Токен содержит email пользователя в payload.
+            при успешной аутентификации. Токен содержит email пользователя в payload,
+            а при TOKEN_PROFILE_CLAIMS — весь публичный профиль и его версию.
+            Хеш пароля с устаревшими параметрами пересчитывается и сохраняется.
 
             Args:
                 form_data (OAuth2PasswordRequestForm): Форма с данными для входа:
@@ -67,10 +107,11 @@ class UserService:
                     - password: Пароль пользователя
 
             Returns:
-                SToken: Объект с JWT токеном в формате:
+                SToken: Объект с JWT токенами в формате:
                     {
                         "access_token": "eyJhbGciOi...",
-                        "token_type": "Bearer"
+                        "token_type": "Bearer",
+                        "refresh_token": "eyJhbGciOi..."
                     }
 
             Raises:
@@ -79,29 +120,93 @@ class UserService:
                     - неверный пароль (если добавите проверку пароля)
                     - учетная запись неактивна"""
 
-        user = await self.users_repo.find_one_or_none(filters=SEmailModel(email=form_data.username))
+        user = await self.users_repo.find_one_by("email", form_data.username, columns=LOGIN_COLUMNS)
         if not user:
-            logger.warning(f"Login attempt for non-existent user: {form_data.username}")
+            logger.warning("Login attempt for non-existent user: {}", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        if not verify_password(form_data.password, user.password):
-            logger.warning(f"Invalid password attempt for user: {user.email}")
+        if not await verify_password(form_data.password, user.password):
+            logger.warning("Invalid password attempt for user: {}", user.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if password_needs_update(user.password):
+            # Параметры хеширования изменились: пересчитываем хеш, пока известен пароль
+            await self.users_repo.update(
+                filters=SUserSearch(id=user.id),
+                values=SUserPasswordUpdate(password=await get_password_hash(form_data.password)),
+            )
+            logger.info("Password hash upgraded for user: {}", user.email)
+        logger.info("Successful login for {} {}", user.role.value, user.email)
+        return self._issue_tokens(user)
+
+    def _issue_tokens(self, user) -> SToken:
+        """
+        Выпускает пару access и refresh токенов для пользователя.
+
+        :param user: Пользователь.
+        :return: Токены.
+        """
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={
+        if settings.TOKEN_PROFILE_CLAIMS:
+            token_data = profile_claims(SUserPrincipal.model_validate(user))
+        else:
+            token_data = {
                 "sub": user.email,
                 "role": user.role.value
-            },
-            expires_delta=access_token_expires
-        )
+            }
+        access_token = create_access_token(data=token_data, expires_delta=access_token_expires)
+        refresh_token = create_refresh_token(user.email)
+        return SToken(access_token=access_token, token_type="Bearer", refresh_token=refresh_token)
+
+    async def refresh(self, refresh_token: str) -> SToken:
+        """
+        Обмен refresh токена на новую пару токенов (ротация).
+
+        Пароль повторно не проверяется. Предъявленный refresh токен отзывается;
+        повторное предъявление того же токена отклоняется.
+
+        :param refresh_token: Refresh токен.
+        :return: Новые access и refresh токены.
+        :raises HTTPException: 401 UNAUTHORIZED, если токен невалиден, уже использован
+            или пользователь не найден.
+        """
+        try:
+            payload = decode_refresh_token(refresh_token)
+        except InvalidTokenError as err:
+            logger.warning("Invalid refresh token")
+            raise NoJwtException from err
+
+        if not await RevocationService(self.session).revoke(payload["jti"], payload["exp"]):
+            logger.warning("Reuse of revoked refresh token for user: {}", payload["sub"])
+            raise TokenRevokedException
+
+        user = await self.get_user_by_email(payload["sub"])
+        if not user:
+            raise NoJwtException
+        return self._issue_tokens(user)
 
-        logger.info(f"Successful login for {user.role} {user.email}")
-        return SToken(access_token=access_token, token_type="Bearer")
+    async def logout(self, access_payload: dict, refresh_token: str | None = None) -> None:
+        """
+        Выход пользователя: отзывает текущий access токен и, если передан, refresh токен.
+
+        :param access_payload: Payload проверенного access токена.
+        :param refresh_token: Refresh токен того же пользователя.
+        """
+        revocation_service = RevocationService(self.session)
+        if "jti" in access_payload:
+            await revocation_service.revoke(access_payload["jti"], access_payload["exp"])
+        if refresh_token is not None:
+            try:
+                payload = decode_refresh_token(refresh_token)
+            except InvalidTokenError:
+                logger.warning("Invalid refresh token on logout")
+            else:
+                if payload["sub"] == access_payload.get("sub"):
+                    await revocation_service.revoke(payload["jti"], payload["exp"])
+        logger.info("Logout for user: {}", access_payload.get("sub"))
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.database.database import TrackedSession, engine, replica_set
+from app.repositories.auth_repository import UsersRepository
+from app.schemas.users_schema import LOGIN_COLUMNS, PRINCIPAL_COLUMNS
+from app.services.revocation_service import sync_revocation_list
+from app.utils import password_hasher
+
+# Адрес для прогрева запросов; пользователя с таким адресом быть не может
+WARMUP_EMAIL = "warmup@invalid"
+
+
+async def prime_connection(connection) -> None:
+    """Выполняет на соединении частые запросы, чтобы подготовить их выражения заранее."""
+    async with AsyncSession(bind=connection, sync_session_class=TrackedSession) as session:
+        users_repo = UsersRepository(session)
+        await users_repo.find_one_by("email", WARMUP_EMAIL, columns=PRINCIPAL_COLUMNS)
+        await users_repo.find_one_by("email", WARMUP_EMAIL, columns=LOGIN_COLUMNS)
+        await users_repo.find_one_by("id", 0, columns=PRINCIPAL_COLUMNS)
+        await users_repo.exists_by("email", WARMUP_EMAIL)
+
+
+async def warm_up_engine(async_engine: AsyncEngine, connections: int) -> None:
+    """
+    Открывает connections соединений одновременно и прогревает на каждом частые запросы.
+
+    Соединения возвращаются в пул открытыми: первые запросы не тратят время на
+    установку соединения и загрузку типов, а подготовленные выражения asyncpg
+    уже находятся в кеше каждого соединения.
+    Открывшиеся соединения закрываются (возвращаются в пул) и при ошибке прогрева.
+
+    :raises Exception: Первая ошибка открытия или прогрева соединения.
+    """
+    results = await asyncio.gather(
+        *(async_engine.connect().start() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    try:
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not errors:
+            results = await asyncio.gather(*(prime_connection(connection) for connection in opened), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened), return_exceptions=True)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Прогрев приложения при старте; по завершении приложение отмечается готовым.
+
+    Список отозванных токенов загружается всегда, остальные шаги — при WARMUP_ENABLED.
+    При ошибке прогрев повторяется через WARMUP_RETRY_SECONDS, а приложение остается неготовым.
+    Обязателен только прогрев основной БД: недоступная реплика пропускается, а чтение
+    с нее переходит на основную БД до возвращения реплики в ротацию.
+    """
+    while True:
+        started = time.perf_counter()
+        try:
+            await sync_revocation_list()
+            if settings.WARMUP_ENABLED:
+                connections = min(settings.WARMUP_DB_CONNECTIONS or settings.DB_POOL_SIZE, settings.DB_POOL_SIZE)
+                primary, *replicas = await asyncio.gather(
+                    *(warm_up_engine(async_engine, connections) for async_engine in (engine, *replica_set.engines)),
+                    return_exceptions=True,
+                )
+                if isinstance(primary, BaseException):
+                    raise primary
+                for index, error in enumerate(replicas):
+                    if isinstance(error, BaseException):
+                        replica_set.eject(index)
+                        logger.warning(
+                            "Реплика {} не прогрета: {}",
+                            replica_set.engines[index].url.render_as_string(hide_password=True), error,
+                        )
+                workers = await password_hasher.warm_up()
+                app.openapi()
+                logger.info(
+                    "Прогрев завершен за {:.2f} с: соединений {}, процессов хеширования {}",
+                    time.perf_counter() - started, connections, workers,
+                )
+            break
+        except Exception as e:
+            logger.error("Ошибка прогрева, повтор через {} с: {}", settings.WARMUP_RETRY_SECONDS, e)
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+    app.state.ready = True
@@ -1,11 +1,163 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from loguru import logger
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_DURATION, Timer
+
+# Поддерживаемые алгоритмы; все, кроме выбранного, считаются устаревшими
+PASSWORD_HASH_SCHEMES = ("bcrypt", "pbkdf2_sha256")
+
+
+def build_crypt_context(scheme: str, rounds: int | None = None) -> CryptContext:
+    """
+    Создает контекст хеширования с выбранным алгоритмом по умолчанию.
+
+    :param scheme: Алгоритм из PASSWORD_HASH_SCHEMES.
+    :param rounds: Стоимость хеширования (None — значение passlib по умолчанию).
+    :return: Контекст passlib, для которого хеши других алгоритмов и стоимости требуют обновления.
+    """
+    if scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Неподдерживаемый алгоритм хеширования: {scheme}")
+    schemes = [scheme, *(name for name in PASSWORD_HASH_SCHEMES if name != scheme)]
+    options = {f"{scheme}__rounds": rounds} if rounds else {}
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
 
 
-def get_password_hash(password: str) -> str:
+pwd_context = build_crypt_context(settings.PASSWORD_HASH_SCHEME, settings.PASSWORD_HASH_ROUNDS)
+
+
+def hash_password_sync(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def hash_passwords_sync(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def warm_up_sync() -> int:
+    """Загружает backend хеширования в процессе пула и возвращает его PID."""
+    pwd_context.dummy_verify()
+    return os.getpid()
+
+
+class PasswordHasher:
+    """
+    Асинхронный сервис хеширования паролей.
+
+    bcrypt занимает процессор на сотни миллисекунд, поэтому вычисления выполняются
+    в пуле процессов, а event loop только ожидает результат. Пул создается лениво
+    при первом обращении и ограничен max_workers процессами. Если процесс пула
+    аварийно завершился, пул пересоздается и вызов повторяется один раз.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        """
+        :param max_workers: Размер пула процессов (None — по числу CPU).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Сбрасывает сломанный пул; пул, уже пересозданный другим вызовом, не трогает."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Выполняет fn в пуле процессов, пересоздавая пул, если он сломан."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            logger.warning("Пул процессов хеширования сломан, пересоздание пула")
+            self._discard_executor(executor)
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        """Хеширует пароль в пуле процессов."""
+        with Timer(PASSWORD_HASH_DURATION, "hash"):
+            return await self._run(hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Проверяет пароль по хешу в пуле процессов."""
+        with Timer(PASSWORD_HASH_DURATION, "verify"):
+            return await self._run(verify_password_sync, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: list[str], batch_size: int = settings.PASSWORD_HASH_BATCH_SIZE) -> list[str]:
+        """
+        Хеширует список паролей небольшими порциями.
+
+        В пуле одновременно находится не больше max_workers порций, поэтому хеширование
+        при входе и регистрации ждет завершения одной порции, а не всего списка.
+
+        :param passwords: Пароли в открытом виде.
+        :param batch_size: Количество паролей в одной задаче пула.
+        :return: Хеши в том же порядке.
+        """
+        batches = [passwords[i:i + batch_size] for i in range(0, len(passwords), batch_size)]
+        results: list[list[str]] = [[] for _ in batches]
+        pending = iter(enumerate(batches))
+
+        async def worker() -> None:
+            for index, batch in pending:
+                results[index] = await self._run(hash_passwords_sync, batch)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_workers, len(batches)))))
+        return [hashed for batch in results for hashed in batch]
+
+    async def warm_up(self) -> int:
+        """
+        Запускает все процессы пула и загружает в них backend хеширования,
+        чтобы первые запросы не ждали старта процессов.
+
+        :return: Количество запущенных процессов.
+        """
+        pids = await asyncio.gather(*(self._run(warm_up_sync) for _ in range(self.max_workers)))
+        return len(set(pids))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Останавливает пул процессов. При следующем обращении пул будет создан заново."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
+
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+def password_needs_update(hashed_password: str) -> bool:
+    """Проверяет, отличаются ли алгоритм или стоимость хеша от текущих настроек."""
+    return pwd_context.needs_update(hashed_password)
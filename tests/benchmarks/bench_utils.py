@@ -0,0 +1,88 @@
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+
+def latency_summary(latencies: list[float], duration: float) -> dict:
+    """
+    Сводка по задержкам запросов.
+
+    :param latencies: Задержки отдельных запросов в секундах.
+    :param duration: Длительность фазы в секундах.
+    :return: Количество запросов, requests/sec и перцентили задержки в миллисекундах.
+    """
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "count": len(latencies),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict) -> list[str]:
+    """
+    Сравнивает результаты с baseline и возвращает описания регрессий.
+
+    Регрессией считается рост p95 или падение requests/sec больше чем на BENCH_MAX_REGRESSION.
+    """
+    max_regression = float(os.getenv("BENCH_MAX_REGRESSION", "0.2"))
+    regressions = []
+    for section, metrics in results.items():
+        for name, current in metrics.items():
+            previous = baseline.get(section, {}).get(name)
+            if not isinstance(current, dict) or not previous:
+                continue
+            for key, worse_if_higher in (("p95_ms", True), ("rps", False), ("ns_per_call", True)):
+                if key not in current or not previous.get(key):
+                    continue
+                change = (current[key] - previous[key]) / previous[key]
+                print(f"{section}/{name} {key}: {previous[key]} -> {current[key]} ({change:+.1%})")
+                if (change if worse_if_higher else -change) > max_regression:
+                    regressions.append(f"{section}/{name} {key}: {previous[key]} -> {current[key]}")
+    return regressions
+
+
+def measure(call: Callable[[], object], calls: int, warmup: int = 100) -> dict:
+    """
+    Среднее время одного синхронного вызова в наносекундах после прогрева.
+
+    :param call: Измеряемая функция без аргументов.
+    :param calls: Количество измеряемых вызовов.
+    :param warmup: Количество вызовов прогрева.
+    """
+    for _ in range(warmup):
+        call()
+    started = time.perf_counter_ns()
+    for _ in range(calls):
+        call()
+    return {"calls": calls, "ns_per_call": (time.perf_counter_ns() - started) // calls}
+
+
+async def measure_async(call: Callable[[], Awaitable[object]], calls: int, warmup: int = 50) -> dict:
+    """Среднее время одного асинхронного вызова в наносекундах после прогрева, как в measure."""
+    for _ in range(warmup):
+        await call()
+    started = time.perf_counter_ns()
+    for _ in range(calls):
+        await call()
+    return {"calls": calls, "ns_per_call": (time.perf_counter_ns() - started) // calls}
+
+
+def check_baseline(section: str, results: dict) -> None:
+    """
+    Сравнивает результаты раздела с baseline из BENCH_BASELINE, если он задан.
+
+    :raises AssertionError: Если найдены регрессии.
+    """
+    baseline_path = os.getenv("BENCH_BASELINE")
+    if not baseline_path or not Path(baseline_path).exists():
+        return
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    regressions = compare_with_baseline({section: results}, baseline)
+    assert not regressions, f"Регрессия относительно baseline: {regressions}"
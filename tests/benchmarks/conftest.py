@@ -0,0 +1,83 @@
+"""
+Нагрузочные тесты и микробенчмарки.
+
+Запускаются только при RUN_BENCHMARKS=1:
+    RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+
+Параметры задаются переменными окружения:
+    BENCH_DATABASE_URL   — БД для прогона (по умолчанию PostgreSQL из настроек,
+                           "sqlite+aiosqlite://" — встроенная БД в памяти процесса)
+    BENCH_USERS          — количество виртуальных пользователей
+    BENCH_ME_REQUESTS    — количество запросов /me на пользователя
+    BENCH_LOOKUPS        — количество вызовов в микробенчмарке поиска пользователя
+    BENCH_SERIALIZATIONS — количество вызовов в микробенчмарке сериализации ответов
+    BENCH_OUTPUT         — файл для сохранения результатов в JSON
+    BENCH_BASELINE       — файл с результатами предыдущего прогона для сравнения
+    BENCH_MAX_REGRESSION — допустимое ухудшение p95 и requests/sec относительно baseline (0.2 = 20%)
+"""
+import json
+import os
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.database.database import TrackedSession
+from app.dependencies.repository_dep import (
+    get_session_with_commit, get_session_without_commit, get_session_read_only
+)
+from app.main import app as main_app
+
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS") == "1"
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", settings.get_db_url_async)
+
+
+def pytest_runtest_setup(item):
+    if not RUN_BENCHMARKS:
+        pytest.skip("Бенчмарки запускаются только при RUN_BENCHMARKS=1")
+
+
+@pytest.fixture(scope="session")
+def bench_results():
+    """Собирает результаты бенчмарков и сохраняет их в BENCH_OUTPUT по завершении сессии."""
+    results: dict[str, dict] = {}
+    yield results
+    if not results:
+        return
+    output = Path(os.getenv("BENCH_OUTPUT", "bench_results.json"))
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nРезультаты бенчмарков сохранены в {output}")
+
+
+@pytest.fixture(scope="session")
+async def async_engine() -> AsyncEngine:
+    if BENCH_DATABASE_URL.startswith("sqlite"):
+        # Одно соединение на весь прогон, иначе у каждого соединения своя БД в памяти
+        engine = create_async_engine(BENCH_DATABASE_URL, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(BENCH_DATABASE_URL, pool_size=20, max_overflow=20)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def bench_app(async_engine, monkeypatch):
+    """Приложение, работающее с БД бенчмарка, без ограничения частоты входа."""
+    session_maker = async_sessionmaker(
+        async_engine, class_=AsyncSession, sync_session_class=TrackedSession, expire_on_commit=False
+    )
+
+    async def get_bench_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_maker() as session:
+            yield session
+            if session.sync_session.has_writes:
+                await session.commit()
+
+    monkeypatch.setattr(settings, "LOGIN_THROTTLE_ENABLED", False)
+    for dependency in (get_session_with_commit, get_session_without_commit, get_session_read_only):
+        main_app.dependency_overrides[dependency] = get_bench_session
+    yield main_app
+    main_app.dependency_overrides.clear()
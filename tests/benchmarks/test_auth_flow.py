@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from httpx import AsyncClient
+
+from bench_utils import latency_summary, check_baseline
+
+BENCH_USERS = int(os.getenv("BENCH_USERS", "20"))
+BENCH_ME_REQUESTS = int(os.getenv("BENCH_ME_REQUESTS", "10"))
+
+
+async def run_phase(requests) -> tuple[list[float], float]:
+    """
+    Выполняет запросы конкурентно и замеряет задержку каждого.
+
+    :param requests: Корутины-фабрики запросов, по одной на виртуального пользователя;
+                     каждая возвращает список задержек.
+    :return: Задержки всех запросов и длительность фазы в секундах.
+    """
+    started = time.perf_counter()
+    results = await asyncio.gather(*(request() for request in requests))
+    return [latency for latencies in results for latency in latencies], time.perf_counter() - started
+
+
+async def timed(call) -> float:
+    started = time.perf_counter()
+    response = await call
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.text
+    return elapsed
+
+
+async def test_auth_flow_throughput(bench_app, async_client: AsyncClient, bench_results):
+    run_id = uuid.uuid4().hex[:8]
+    users = [
+        {
+            "email": f"bench-{run_id}-{i}@example.com",
+            "first_name": "Bench",
+            "last_name": "Userov",
+            "role": "patient",
+            "password": "password",
+            "confirm_password": "password",
+        }
+        for i in range(BENCH_USERS)
+    ]
+    tokens: dict[str, str] = {}
+
+    async def register(user):
+        return [await timed(async_client.post("/register", json=user))]
+
+    async def login(user):
+        started = time.perf_counter()
+        response = await async_client.post("/login", data={"username": user["email"], "password": user["password"]})
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.text
+        tokens[user["email"]] = response.json()["access_token"]
+        return [elapsed]
+
+    async def me(user):
+        headers = {"Authorization": f"Bearer {tokens[user['email']]}"}
+        return [await timed(async_client.get("/me", headers=headers)) for _ in range(BENCH_ME_REQUESTS)]
+
+    routes = {}
+    for route, request in (("POST /register", register), ("POST /login", login), ("GET /me", me)):
+        latencies, duration = await run_phase([lambda user=user: request(user) for user in users])
+        routes[route] = latency_summary(latencies, duration)
+
+    bench_results["auth_flow"] = routes
+    print("\n" + json.dumps({"users": BENCH_USERS, "me_requests": BENCH_ME_REQUESTS, "routes": routes}, indent=2))
+
+    check_baseline("auth_flow", routes)
@@ -0,0 +1,52 @@
+import json
+import os
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.database.base import Base
+from app.models.users import User
+from app.repositories.auth_repository import UsersRepository
+from app.repositories.base_repository import lookup_statement
+from app.schemas.users_schema import SEmailModel, PRINCIPAL_COLUMNS
+
+from bench_utils import check_baseline, measure, measure_async
+
+BENCH_LOOKUPS = int(os.getenv("BENCH_LOOKUPS", "2000"))
+
+
+async def test_email_lookup_overhead(async_engine: AsyncEngine, bench_results):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    email = f"lookup-{uuid.uuid4().hex[:8]}@example.com"
+    async with session_maker() as session:
+        session.add(User(email=email, first_name="Bench", last_name="Userov", password="hash"))
+        await session.commit()
+
+    async with session_maker() as session:
+        repo = UsersRepository(session)
+        results = {
+            "build_filter_by": measure(
+                lambda: repo._select(PRINCIPAL_COLUMNS).filter_by(**SEmailModel(email=email).model_dump()),
+                BENCH_LOOKUPS, warmup=0,
+            ),
+            "build_cached": measure(
+                lambda: lookup_statement(User, "email", PRINCIPAL_COLUMNS), BENCH_LOOKUPS, warmup=0
+            ),
+            "find_one_or_none": await measure_async(
+                lambda: repo.find_one_or_none(filters=SEmailModel(email=email), columns=PRINCIPAL_COLUMNS),
+                BENCH_LOOKUPS,
+            ),
+            "find_one_by": await measure_async(
+                lambda: repo.find_one_by("email", email, columns=PRINCIPAL_COLUMNS), BENCH_LOOKUPS
+            ),
+            "exists_by": await measure_async(lambda: repo.exists_by("email", email), BENCH_LOOKUPS),
+        }
+        assert (await repo.find_one_by("email", email, columns=PRINCIPAL_COLUMNS)).email == email
+        assert await repo.exists_by("email", email)
+
+    bench_results["repository_lookup"] = results
+    print("\n" + json.dumps(results, indent=2))
+
+    check_baseline("repository_lookup", results)
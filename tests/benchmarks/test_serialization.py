@@ -0,0 +1,43 @@
+import json
+import os
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.api.responses import PRINCIPAL_ADAPTER, TOKEN_ADAPTER, json_response
+from app.models.users import RoleEnum, User
+from app.schemas.users_schema import SToken, SUserPrincipal
+
+from bench_utils import check_baseline, measure
+
+BENCH_SERIALIZATIONS = int(os.getenv("BENCH_SERIALIZATIONS", "20000"))
+
+
+def test_response_serialization_cost(bench_results):
+    user = User(
+        id=1, email="user@example.com", first_name="Bench", last_name="Userov",
+        password="$2b$12$" + "x" * 53, role=RoleEnum.patient,
+    )
+    principal = SUserPrincipal.model_validate(user)
+    token = SToken(access_token="a" * 250, token_type="Bearer", refresh_token="r" * 250)
+
+    results = {
+        # Прежний /me: ORM-сущность целиком через jsonable_encoder и стандартный json
+        "me_orm_jsonable_encoder": measure(lambda: JSONResponse(jsonable_encoder(user)), BENCH_SERIALIZATIONS),
+        # Валидация по response_model и сериализация в ORJSONResponse
+        "me_validate_orjson": measure(
+            lambda: ORJSONResponse(PRINCIPAL_ADAPTER.dump_python(SUserPrincipal.model_validate(user), mode="json")),
+            BENCH_SERIALIZATIONS,
+        ),
+        # Быстрый путь: проверенный снимок сразу в JSON
+        "me_fast_path": measure(lambda: json_response(PRINCIPAL_ADAPTER, principal), BENCH_SERIALIZATIONS),
+        "token_jsonable_encoder": measure(lambda: JSONResponse(jsonable_encoder(token)), BENCH_SERIALIZATIONS),
+        "token_fast_path": measure(lambda: json_response(TOKEN_ADAPTER, token), BENCH_SERIALIZATIONS),
+    }
+    assert json.loads(json_response(PRINCIPAL_ADAPTER, principal).body) == principal.model_dump(mode="json")
+    assert "password" not in json_response(PRINCIPAL_ADAPTER, principal).body.decode()
+
+    bench_results["serialization"] = results
+    print("\n" + json.dumps(results, indent=2))
+
+    check_baseline("serialization", results)
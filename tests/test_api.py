@@ -36,3 +36,81 @@ async def test_full_auth_flow(async_client: AsyncClient):
     assert me_response.status_code == 200
     me_data = me_response.json()
     assert me_data["email"] == user["email"]
+
+
+def make_user(email: str, role: str = "patient") -> dict:
+    return {
+        "email": email,
+        "first_name": "Test",
+        "last_name": "Testov",
+        "role": role,
+        "password": "password",
+        "confirm_password": "password"
+    }
+
+
+@pytest.mark.asyncio
+async def test_register_existing_email_returns_conflict(async_client: AsyncClient):
+    user = make_user("conflict@example.com")
+    assert (await async_client.post("/register", json=user)).status_code == 200
+
+    # Повторная вставка не проходит ON CONFLICT DO NOTHING и превращается в 409
+    response = await async_client.post("/register", json=user)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Пользователь уже существует"
+
+
+@pytest.mark.asyncio
+async def test_email_is_case_insensitive(async_client: AsyncClient):
+    assert (await async_client.post("/register", json=make_user("case@example.com"))).status_code == 200
+
+    # Тот же адрес в другом регистре считается существующим
+    response = await async_client.post("/register", json=make_user("Case@Example.com"))
+    assert response.status_code == 409
+
+    # Вход и поиск пользователя не зависят от регистра email
+    login_response = await async_client.post(
+        "/login",
+        data={"username": "CASE@example.COM", "password": "password"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    assert login_response.status_code == 200
+    token = login_response.json()["access_token"]
+
+    me_response = await async_client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert me_response.status_code == 200
+    assert me_response.json()["email"] == "case@example.com"
+
+
+@pytest.mark.asyncio
+async def test_admin_users_keyset_pagination(async_client: AsyncClient):
+    from app.core.security import create_access_token
+
+    emails = {f"page{i}@example.com" for i in range(5)}
+    for email in emails:
+        assert (await async_client.post("/register", json=make_user(email, role="doctor"))).status_code == 200
+    token = create_access_token({"sub": "admin@example.com", "role": "admin"})
+
+    ids, pages, cursor = [], 0, None
+    while True:
+        params = {"role": "doctor", "limit": 2, **({"after": cursor} if cursor is not None else {})}
+        response = await async_client.get(
+            "/admin/users", params=params, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        ids += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        assert cursor == page["items"][-1]["id"]
+
+    # Страницы идут по возрастанию id без повторов и пропусков
+    assert ids == sorted(set(ids))
+    assert pages == 3
+    response = await async_client.get(
+        "/admin/users", params={"role": "doctor", "limit": 1000}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert [item["id"] for item in response.json()["items"]] == ids
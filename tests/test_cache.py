@@ -0,0 +1,41 @@
+import time
+
+from app.core.cache import TTLCache, token_cache
+from app.core.security import create_access_token, decode_access_token
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=1)
+    cache.set("a", 1)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_discard_where():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.discard_where(lambda value: value == 2) == 1
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_decode_access_token_verifies_signature_once():
+    token = create_access_token({"sub": "cached@example.com"})
+    hits = token_cache.hits
+    assert decode_access_token(token)["sub"] == "cached@example.com"
+    assert decode_access_token(token)["sub"] == "cached@example.com"
+    assert token_cache.hits == hits + 1
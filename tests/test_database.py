@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import InvalidRequestError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import database
+from app.database.database import ReplicaSet, TrackedSession, on_commit
+
+
+def test_on_commit_runs_callbacks_only_after_commit():
+    engine = create_engine("sqlite://")
+    called = []
+
+    with TrackedSession(engine) as session:
+        session.execute(text("SELECT 1"))
+        on_commit(session, lambda: called.append("rolled back"))
+        session.rollback()
+
+        session.execute(text("SELECT 1"))
+        on_commit(session, lambda: called.append("committed"))
+        assert called == []
+        session.commit()
+
+    assert called == ["committed"]
+
+
+def test_text_writes_are_tracked_and_rejected_in_read_only_sessions():
+    engine = create_engine("sqlite://")
+
+    with TrackedSession(engine) as session:
+        session.execute(text("SELECT 1"))
+        assert not session.has_writes
+        session.execute(text("CREATE TABLE t (x INTEGER)"))
+        assert session.has_writes
+
+    with TrackedSession(engine, info={"read_only": True}) as session:
+        session.execute(text("SELECT 1"))
+        with pytest.raises(InvalidRequestError):
+            session.execute(text("INSERT INTO t VALUES (1)"))
+
+
+async def _marked_engine(path, marker: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        await conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": marker})
+    return engine
+
+
+async def test_replica_set_round_robin_and_ejection(tmp_path):
+    first = await _marked_engine(tmp_path / "first.db", "first")
+    second = await _marked_engine(tmp_path / "second.db", "second")
+    replicas = ReplicaSet([first, second], eject_seconds=60)
+    try:
+        chosen = [replicas.choose() for _ in range(4)]
+        assert chosen[0] is not chosen[1]
+        assert chosen[:2] == chosen[2:]
+
+        replicas.eject(0)
+        assert {replicas.choose() for _ in range(3)} == {chosen[1]}
+        assert [replica["healthy"] for replica in replicas.stats()] == [False, True]
+
+        replicas.eject(1)
+        assert replicas.choose() is None
+    finally:
+        await first.dispose()
+        await second.dispose()
+
+
+async def test_replica_connection_error_ejects_replica(tmp_path):
+    healthy = await _marked_engine(tmp_path / "healthy.db", "healthy")
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'broken.db'}")
+    replicas = ReplicaSet([healthy, broken], eject_seconds=60)
+    try:
+        with pytest.raises(OperationalError):
+            async with broken.connect():
+                pass
+
+        assert [replica["healthy"] for replica in replicas.stats()] == [True, False]
+        assert {replicas.choose() for _ in range(3)} == {replicas._binds[0]}
+    finally:
+        await healthy.dispose()
+        await broken.dispose()
+
+
+async def test_read_only_sessions_route_to_replica_and_fall_back_to_primary(tmp_path, monkeypatch):
+    primary = await _marked_engine(tmp_path / "primary.db", "primary")
+    replica = await _marked_engine(tmp_path / "replica.db", "replica")
+    replicas = ReplicaSet([replica], eject_seconds=60)
+    monkeypatch.setattr(database, "replica_set", replicas)
+
+    async def read_marker(**kwargs) -> str:
+        async with AsyncSession(primary, sync_session_class=TrackedSession, **kwargs) as session:
+            return (await session.execute(text("SELECT name FROM marker"))).scalar_one()
+
+    try:
+        assert await read_marker(info={"read_only": True}) == "replica"
+        assert await read_marker() == "primary"
+
+        replicas.eject(0)
+        assert await read_marker(info={"read_only": True}) == "primary"
+    finally:
+        await primary.dispose()
+        await replica.dispose()
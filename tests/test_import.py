@@ -0,0 +1,35 @@
+import io
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.repositories.auth_repository import UsersRepository
+from app.services import import_service
+from app.services.import_service import UserImportService
+
+
+async def test_import_reports_in_chunk_duplicates_as_conflicts(monkeypatch):
+    async def hash_many(passwords):
+        return [f"hash-{password}" for password in passwords]
+
+    async def bulk_insert_if_absent(self, rows):
+        return list(dict.fromkeys(row[2] for row in rows if row[2] != "old@example.com"))
+
+    @asynccontextmanager
+    async def session_maker():
+        @asynccontextmanager
+        async def begin():
+            yield
+        yield SimpleNamespace(begin=begin)
+
+    monkeypatch.setattr(import_service.password_hasher, "hash_many", hash_many)
+    monkeypatch.setattr(UsersRepository, "bulk_insert_if_absent", bulk_insert_if_absent)
+    lines = [
+        '{"email": "%s", "first_name": "Test", "last_name": "Testov", "password": "password"}' % email
+        for email in ("new@example.com", "old@example.com", "New@example.com")
+    ]
+
+    report = await UserImportService(session_maker=session_maker).import_stream(io.StringIO("\n".join(lines)), "jsonl")
+
+    assert report.inserted == 1
+    assert report.conflicts == 2
+    assert report.conflict_samples == ["old@example.com", "new@example.com"]
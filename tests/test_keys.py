@@ -0,0 +1,32 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.core.keys import KeyRing
+
+
+def test_keyring_rotation_keeps_old_tokens_valid():
+    old_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    old_ring = KeyRing("RS256", keys={"k1": old_key}, active_kid="k1")
+    kid, key = old_ring.signing_key()
+    token = jwt.encode({"sub": "user@example.com"}, key, algorithm="RS256", headers={"kid": kid})
+
+    ring = KeyRing("RS256", keys={"k1": old_key.public_key(), "k2": new_key}, active_kid="k2")
+
+    assert ring.signing_key()[0] == "k2"
+    assert jwt.decode(token, ring.verification_key(token), algorithms=["RS256"])["sub"] == "user@example.com"
+    assert [jwk["kid"] for jwk in ring.jwks()["keys"]] == ["k1", "k2"]
+    public_key = RSAAlgorithm.from_jwk(ring.jwks()["keys"][0])
+    assert jwt.decode(token, public_key, algorithms=["RS256"])["sub"] == "user@example.com"
+
+
+def test_keyring_rejects_unknown_kid():
+    ring = KeyRing("EdDSA", keys={"k1": ed25519.Ed25519PrivateKey.generate()}, active_kid="k1")
+    other = ed25519.Ed25519PrivateKey.generate()
+    token = jwt.encode({"sub": "user@example.com"}, other, algorithm="EdDSA", headers={"kid": "k9"})
+
+    assert ring.jwks()["keys"][0]["kty"] == "OKP"
+    with pytest.raises(jwt.InvalidTokenError):
+        ring.verification_key(token)
@@ -0,0 +1,18 @@
+from app.core.logging import SamplingFilter, redact
+
+
+def test_redact_masks_emails_and_password_hashes():
+    text = redact("login user@example.com with '$2b$12$CvSl.k3lF1POPksP3CqTV.XdZyPquP91681BzzVj.HsA3CF8xcFM6'")
+    assert "user@example.com" not in text
+    assert "u***@example.com" in text
+    assert "<password hash>" in text
+
+
+def test_sampling_filter_keeps_every_nth_info_record():
+    sampling = SamplingFilter({"app.repositories": 0.25})
+    info = {"name": "app.repositories.base_repository", "level": type("Level", (), {"no": 20})()}
+    error = {"name": "app.repositories.base_repository", "level": type("Level", (), {"no": 40})()}
+    other = {"name": "app.services.users_service", "level": type("Level", (), {"no": 20})()}
+    assert [sampling(info) for _ in range(8)].count(True) == 2
+    assert sampling(error)
+    assert sampling(other)
@@ -0,0 +1,21 @@
+from app.core.metrics import Counter, Histogram, OVERFLOW_LABEL
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_duration_seconds", "Тестовая гистограмма", labels=("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/me")
+    histogram.observe(0.5, "/me")
+    text = histogram.render()
+    assert 'test_duration_seconds_bucket{route="/me",le="0.1"} 1' in text
+    assert 'test_duration_seconds_bucket{route="/me",le="1.0"} 2' in text
+    assert 'test_duration_seconds_bucket{route="/me",le="+Inf"} 2' in text
+    assert 'test_duration_seconds_count{route="/me"} 2' in text
+
+
+def test_metric_series_are_bounded():
+    counter = Counter("test_total", "Тестовый счетчик", labels=("key",), max_series=2)
+    for key in ("a", "b", "c", "d"):
+        counter.inc(key)
+    text = counter.render()
+    assert 'key="c"' not in text
+    assert f'test_total{{key="{OVERFLOW_LABEL}"}} 2' in text
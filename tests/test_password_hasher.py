@@ -0,0 +1,39 @@
+import asyncio
+import os
+import signal
+
+from app.utils import PasswordHasher, hash_password_sync, warm_up_sync
+
+
+async def test_password_hasher_recovers_from_killed_worker():
+    hasher = PasswordHasher(max_workers=1)
+    hashed = hash_password_sync("password")
+    try:
+        pid = await hasher._run(warm_up_sync)
+        os.kill(pid, signal.SIGKILL)
+
+        assert await hasher.verify("password", hashed)
+        assert await hasher._run(warm_up_sync) != pid
+    finally:
+        hasher.shutdown()
+
+
+async def test_hash_many_submits_small_bounded_batches(monkeypatch):
+    hasher = PasswordHasher(max_workers=2)
+    in_flight = 0
+    batches = []
+
+    async def run(fn, batch):
+        nonlocal in_flight
+        in_flight += 1
+        batches.append((len(batch), in_flight))
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return [password.upper() for password in batch]
+
+    monkeypatch.setattr(hasher, "_run", run)
+    passwords = [f"p{i}" for i in range(20)]
+
+    assert await hasher.hash_many(passwords, batch_size=3) == [password.upper() for password in passwords]
+    assert max(size for size, _ in batches) == 3
+    assert max(running for _, running in batches) <= 2
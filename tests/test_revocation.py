@@ -0,0 +1,24 @@
+import time
+
+from app.core.revocation import RevocationList
+
+
+def test_revocation_list_add_and_check():
+    revoked = RevocationList()
+    revoked.add("a", time.time() + 60)
+
+    assert revoked.is_revoked("a")
+    assert not revoked.is_revoked("b")
+    assert not revoked.is_revoked(None)
+
+
+def test_revocation_list_replace_keeps_unsynced_local_entries():
+    revoked = RevocationList()
+    revoked.add("local", time.time() + 60)
+    revoked.add("expired", time.time() - 1)
+
+    revoked.replace({"db": time.time() + 60})
+
+    assert revoked.is_revoked("db")
+    assert revoked.is_revoked("local")
+    assert not revoked.is_revoked("expired")
@@ -0,0 +1,25 @@
+import pytest
+from fastapi import HTTPException
+
+from app.dependencies.auth_dep import require_roles
+from app.models.users import RoleEnum
+
+
+async def test_require_roles_follows_hierarchy():
+    check_doctor = require_roles(RoleEnum.doctor)
+    payload = {"sub": "admin@example.com", "role": "admin"}
+
+    assert await check_doctor(payload=payload) is payload
+
+    with pytest.raises(HTTPException) as exc:
+        await check_doctor(payload={"sub": "patient@example.com", "role": "patient"})
+    assert exc.value.status_code == 403
+
+
+async def test_require_roles_without_inheritance_and_role_claim():
+    check_patient = require_roles(RoleEnum.patient, inherit=False)
+
+    with pytest.raises(HTTPException):
+        await check_patient(payload={"sub": "doctor@example.com", "role": "doctor"})
+    with pytest.raises(HTTPException):
+        await check_patient(payload={"sub": "patient@example.com"})
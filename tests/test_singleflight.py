@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+async def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", lookup) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert len(flight) == 0
+    assert await flight.do("key", lookup) == 2
+
+
+async def test_single_flight_propagates_errors_and_survives_leader_cancel():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await asyncio.gather(flight.do("key", failing), flight.do("key", failing))
+    assert len(flight) == 0
+
+    async def slow():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+
+
+async def test_user_lookups_coalesce_only_read_only_sessions(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.repositories.auth_repository import UsersRepository
+    from app.schemas.users_schema import PRINCIPAL_COLUMNS
+    from app.services.users_service import UserService
+
+    sessions = []
+
+    async def find_one_by(self, key, value, columns=None):
+        sessions.append(self._session)
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(email=value)
+
+    monkeypatch.setattr(UsersRepository, "find_one_by", find_one_by)
+    read_only = SimpleNamespace(info={"read_only": True})
+    write = SimpleNamespace(info={})
+
+    await asyncio.gather(
+        UserService(read_only).get_user_by_email("user@example.com", columns=PRINCIPAL_COLUMNS),
+        UserService(read_only).get_user_by_email("user@example.com", columns=PRINCIPAL_COLUMNS),
+        UserService(write).get_user_by_email("user@example.com", columns=PRINCIPAL_COLUMNS),
+    )
+
+    assert sorted(map(id, sessions)) == sorted([id(read_only), id(write)])
@@ -0,0 +1,22 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.throttling import InMemoryThrottleBackend, LoginThrottle
+
+
+async def test_in_memory_backend_limits_attempts_in_window():
+    backend = InMemoryThrottleBackend()
+    assert await backend.hit("key", limit=2, window=60) == 0
+    assert await backend.hit("key", limit=2, window=60) == 0
+    assert 0 < await backend.hit("key", limit=2, window=60) <= 60
+    assert await backend.hit("other", limit=2, window=60) == 0
+
+
+async def test_login_throttle_rejects_with_retry_after():
+    throttle = LoginThrottle(InMemoryThrottleBackend(), account_limit=1, ip_limit=10, window=60)
+    await throttle.check("User@example.com", "10.0.0.1")
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check("user@example.com", "10.0.0.2")
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) > 0
+    assert throttle.stats() == {"ip": 0, "account": 1}